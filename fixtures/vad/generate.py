@@ -0,0 +1,85 @@
+"""Regenerate the synthetic endpointing fixtures of this folder.
+
+Speech is approximated by syllables of voiced harmonics with a varying pitch and
+attack/decay envelope, separated by short gaps and unvoiced (noise) consonants, so
+the energy varies inside words the way it does in real dictation. Only the standard
+library is used: python fixtures/vad/generate.py
+"""
+import json
+import math
+import os
+import random
+import struct
+import wave
+
+RATE = 16000
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def _noise(rng: random.Random, seconds: float, level: float, smoothing: float) -> list:
+    """Low-passed white noise, smoothing close to 1 gives a darker (fan-like) hum."""
+    samples = []
+    value = 0.0
+    for _ in range(int(seconds * RATE)):
+        value = smoothing * value + (1 - smoothing) * rng.gauss(0, 1)
+        samples.append(value)
+    peak = math.sqrt(sum(v * v for v in samples) / len(samples)) or 1.0
+    return [v / peak * level for v in samples]
+
+
+def _speech(rng: random.Random, seconds: float, level: float) -> list:
+    """Syllables filling the given duration."""
+    samples: list = []
+    total = int(seconds * RATE)
+    while len(samples) < total:
+        if rng.random() < 0.3:
+            # Unvoiced consonant: a short, weaker noise burst
+            length = int(rng.uniform(0.04, 0.09) * RATE)
+            samples.extend(rng.gauss(0, level * 0.35) for _ in range(length))
+        length = int(rng.uniform(0.12, 0.25) * RATE)
+        pitch = rng.uniform(100, 220)
+        glide = rng.uniform(-30, 30)
+        phase = 0.0
+        for n in range(length):
+            position = n / length
+            envelope = min(1.0, position / 0.15) * min(1.0, (1 - position) / 0.3)
+            phase += 2 * math.pi * (pitch + glide * position) / RATE
+            voiced = sum(math.sin(k * phase) / k for k in range(1, 7))
+            samples.append(voiced * level * 0.6 * envelope)
+        # Gap between syllables, far shorter than any trailing-silence setting
+        samples.extend([0.0] * int(rng.uniform(0.02, 0.08) * RATE))
+    return samples[:total]
+
+
+def _write(name: str, segments: list, noise_level: float, smoothing: float, seed: int) -> None:
+    """segments: (start, end) seconds of speech; the clip ends 3 s after the last one."""
+    rng = random.Random(seed)
+    duration = segments[-1][1] + 3.0
+    mix = _noise(rng, duration, noise_level, smoothing)
+    for start, end in segments:
+        offset = int(start * RATE)
+        for index, value in enumerate(_speech(rng, end - start, 0.2)):
+            mix[offset + index] += value
+    pcm = [max(-32768, min(32767, int(v * 32767))) for v in mix]
+    with wave.open(os.path.join(DIRECTORY, name + ".wav"), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(struct.pack(f"<{len(pcm)}h", *pcm))
+    with open(os.path.join(DIRECTORY, name + ".json"), "w") as f:
+        json.dump({"speech_end": segments[-1][1]}, f)
+
+
+def main() -> None:
+    # Pause inside the utterance, shorter than the default 700 ms trailing silence
+    _write("pause_short", [(0.4, 1.8), (2.25, 3.6)], 0.002, 0.0, seed=1)
+    # Pause longer than the default, a cut is expected unless the setting is raised
+    _write("pause_long", [(0.4, 1.8), (2.8, 4.0)], 0.002, 0.0, seed=2)
+    # The user takes a while before speaking
+    _write("late_onset", [(2.5, 4.3)], 0.002, 0.0, seed=3)
+    # Fan-like background noise about 15 dB below the speech
+    _write("noisy_background", [(0.3, 3.2)], 0.018, 0.9, seed=4)
+
+
+if __name__ == "__main__":
+    main()
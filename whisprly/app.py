@@ -1,25 +1,55 @@
+import gc
 import os
+import signal
+import socket
 import sys
 import tempfile
-from typing import Optional
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
 import keyboard
+import numpy as np
 import psutil
 from groq import Groq
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import QApplication, QMenu, QMessageBox, QSystemTrayIcon
 
-from .audio import AudioRecorder
+try:
+    from PyQt6.QtMultimedia import QMediaDevices
+except ImportError:
+    QMediaDevices = None  # type: ignore[assignment,misc]
+
+from . import config
+from .archive import ClipArchive
+from .audio import AudioRecorder, autotune_blocksize
+from .capture import ProcessAudioRecorder
+from .devices import DeviceManager
+from .client import create_client
 from .config import (
+    DictationProfile,
     EXIT_SHORTCUT,
-    START_RECORDING_SHORTCUT,
+    get_archive_dir,
+    get_profiler_output_dir,
+    get_spool_dir,
+    get_vocabulary_file_path,
     has_api_key,
-    load_api_key,
+    load_settings,
     reload_settings,
+    save_settings,
 )
+from .hotkeys import HotkeyProcess
+from .ipc import ControlServer
+from .memory import get_children_rss_mb, get_rss_mb, trim_process_memory
+from .metrics import Histogram, WakeupMeter
+from .profiler import SamplingProfiler
 from .settings_window import SettingsWindow
+from .spool import Spool, SpoolEntry, SpoolFlusher, is_transient_error
 from .ui import Notification, OverlayWidget
+from .upload import UploadStats, stream_transcription
+from .vad import Endpointer
+from .vocabulary import Vocabulary
 
 
 class TrayIcon(QSystemTrayIcon):
@@ -34,17 +64,22 @@ class TrayIcon(QSystemTrayIcon):
 
 
 TEMP_FILENAME: str = "audio.wav"
+WAKEUP_SAMPLE_MS: int = 10000
 SAMPLE_RATE: int = 44100
 CHANNELS: int = 1
 
-client: Optional[Groq] = None
-
 
 class VoiceToTextApp(QObject):
     exit_signal = pyqtSignal()
     show_notification_signal = pyqtSignal(str)
     update_notification_signal = pyqtSignal(str)
     hide_notification_signal = pyqtSignal(int)
+    show_overlay_signal = pyqtSignal()
+    activity_signal = pyqtSignal()
+    profiling_finished_signal = pyqtSignal(str)
+    copy_to_clipboard_signal = pyqtSignal(str)
+    tray_message_signal = pyqtSignal(str)
+    end_of_speech_signal = pyqtSignal()
     shutdown_signal = pyqtSignal()
 
     def __init__(self) -> None:
@@ -55,23 +90,73 @@ class VoiceToTextApp(QObject):
             return
 
         self.app: QApplication = QApplication(sys.argv)
-        self.overlay = OverlayWidget()
+        self.overlay: Optional[OverlayWidget] = OverlayWidget()
         self.exit_signal.connect(self.app.quit)
         self.show_notification_signal.connect(self._show_notification)
         self.update_notification_signal.connect(self._update_notification)
         self.hide_notification_signal.connect(self._hide_notification)
+        self.show_overlay_signal.connect(self._show_overlay)
+        self.activity_signal.connect(self._restart_idle_timer)
         self.shutdown_signal.connect(self._perform_shutdown)
-        self.recorder: AudioRecorder = AudioRecorder(
+        self.profiling_finished_signal.connect(self._on_profiling_finished)
+        self.copy_to_clipboard_signal.connect(self._copy_to_clipboard)
+        self.tray_message_signal.connect(self._show_tray_message)
+        self.end_of_speech_signal.connect(self._on_end_of_speech)
+        self.recorder: AudioRecorder | ProcessAudioRecorder = AudioRecorder(
             TEMP_FILENAME, SAMPLE_RATE, CHANNELS
         )
+        self.vocabularies: Dict[str, Vocabulary] = {}
+        self.profiles: Dict[str, DictationProfile] = {}
+        self.active_profile: Optional[DictationProfile] = None
+        self.clients: Dict[str, Groq] = {}
+        # Clients are rebuilt lazily from worker threads and closed by idle mode
+        self.clients_lock = threading.RLock()
+        self.profile_latency: Dict[str, Histogram] = {}
         self.notification: Optional[Notification] = None
-        self.recording_pressed = False
         self.is_recording: bool = False
+        # Both the hotkey thread (second tap) and the endpointer can stop a recording
+        self.recording_lock = threading.Lock()
         self.is_processing = False
         self.settings_window: Optional[SettingsWindow] = None
         self.tray_icon = None
         self.tray_menu = None
         self.pid_file = None
+        self.is_idle: bool = False
+        self._autotune_attempted: bool = False
+        self.idle_timer = QTimer()
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self._enter_idle_mode)
+        self.device_manager = DeviceManager(
+            config.AUDIO_DEVICE,
+            rescan_seconds=config.DEVICE_RESCAN_SECONDS,
+            on_change=lambda index, name: self._apply_device(),
+            is_busy=self._stream_open,
+        )
+        self.media_devices = None
+        if QMediaDevices is not None:
+            # OS notifications for plugged/unplugged devices, so no polling is needed
+            try:
+                self.media_devices = QMediaDevices()
+                self.media_devices.audioInputsChanged.connect(self.device_manager.request_refresh)
+            except Exception as e:
+                print(f"Device change notifications unavailable: {e}")
+        self.wakeup_meter = WakeupMeter()
+        self.signal_notifier: Optional[QSocketNotifier] = None
+        self.profiler = SamplingProfiler(get_profiler_output_dir())
+        self.profiler.on_finished = lambda paths: self.profiling_finished_signal.emit(
+            paths[0]
+        )
+        self.control_server = ControlServer(self._handle_control_command)
+        self.spool = Spool(get_spool_dir(), int(config.SPOOL_MAX_MB * 1024 * 1024))
+        self.spool_flusher = SpoolFlusher(
+            self.spool, self._transcribe_spooled, self._deliver_spooled
+        )
+        self.archive: Optional[ClipArchive] = None
+        self.hotkeys = HotkeyProcess(
+            self._on_hotkey_press, self._on_hotkey_release, self._initiate_shutdown
+        )
+        self._configure_recorder()
+        self._load_profiles()
         self._initialize_client()
 
     def _check_single_instance(self) -> bool:
@@ -142,6 +227,8 @@ class VoiceToTextApp(QObject):
         print("Settings window closed, continuing background operation...")
         # Reload settings in case they were changed
         reload_settings()
+        self._configure_recorder()
+        self._load_profiles()
         self._initialize_client()
         self._reregister_hotkeys()
         # Explicitly ensure the settings window is cleaned up but don't kill the main app
@@ -156,57 +243,118 @@ class VoiceToTextApp(QObject):
             )
 
     def start_recording(self, _: Optional[keyboard.KeyboardEvent] = None) -> None:
-        if not self.is_recording and not self.is_processing:
+        with self.recording_lock:
+            if self.is_recording or self.is_processing:
+                return
             self.is_recording = True
             self.is_processing = True
-            self.recorder.start()
-            self.overlay.show_overlay()
-            self.show_notification_signal.emit("Listening...")
-            print("Recording started...")
+        if self.is_idle:
+            self.is_idle = False
+            self.device_manager.resume()
+        if not self.clients:
+            # Released by idle mode: reconnect and warm up while the user speaks
+            profile = self.active_profile or next(iter(self.profiles.values()))
+            threading.Thread(target=self._client_for, args=(profile,), daemon=True).start()
+        try:
+            self._start_recorder()
+        except Exception as e:
+            print(f"Could not open the input stream: {e}")
+            self.is_recording = False
+            self.is_processing = False
+            self.show_notification_signal.emit("Error! Microphone unavailable")
+            self.hide_notification_signal.emit(2000)
+            self.activity_signal.emit()
+            return
+        self.show_overlay_signal.emit()
+        self.show_notification_signal.emit("Listening...")
+        print("Recording started...")
+
+    def _start_recorder(self) -> None:
+        try:
+            # Never open a stream while the device manager re-initializes PortAudio
+            with self.device_manager.lock:
+                self.recorder.start()
+        except Exception as e:
+            # The cached device may have been unplugged, rescan once and retry
+            print(f"Could not open the input stream ({e}), rescanning devices...")
+            self.device_manager.refresh()
+            with self.device_manager.lock:
+                self.recorder.start()
 
     def stop_recording_and_transcribe(
         self, _: Optional[keyboard.KeyboardEvent] = None
     ) -> None:
-        if self.is_recording:
+        with self.recording_lock:
+            if not self.is_recording:
+                return
             self.is_recording = False
-            self.recorder.stop()
-            print("Recording stopped.")
-            self.recorder.save()
-
-            if not os.path.exists(self.recorder.TEMP_FILENAME):
-                print("Recording was too short. No file saved.")
-                self.update_notification_signal.emit("Recording too short")
-                self.hide_notification_signal.emit(1000)
+        self.recorder.stop()
+        print("Recording stopped.")
+        frames = self.recorder.frames
+        endpointer = self.recorder.endpointer
+
+        if endpointer is not None and endpointer.ended and not endpointer.speech_detected:
+            print("No speech detected.")
+            self.update_notification_signal.emit("No speech detected")
+            self.hide_notification_signal.emit(1000)
+            self.is_processing = False
+            self.activity_signal.emit()
+            return
+
+        if not frames:
+            print("Recording was too short. No audio captured.")
+            self.update_notification_signal.emit("Recording too short")
+            self.hide_notification_signal.emit(1000)
+            self.is_processing = False
+            self.activity_signal.emit()
+            return
+
+        self.update_notification_signal.emit("Transcribing...")
+        profile = self.active_profile or next(iter(self.profiles.values()))
+        released_at = time.perf_counter()
+
+        try:
+            if not self._client_for(profile):
+                self.update_notification_signal.emit("API key not configured")
+                self.hide_notification_signal.emit(2000)
                 self.is_processing = False
                 return
 
-            self.update_notification_signal.emit("Transcribing...")
-
             try:
-                if not client:
-                    self.update_notification_signal.emit("API key not configured")
-                    self.hide_notification_signal.emit(2000)
-                    self.is_processing = False
-                    return
-
-                with open(self.recorder.TEMP_FILENAME, "rb") as file:
-                    transcription: str = client.audio.transcriptions.create(
-                        file=(self.recorder.TEMP_FILENAME, file.read()),
-                        model="whisper-large-v3-turbo",
-                        response_format="text",
-                    )  # type: ignore
-                transcription = transcription.strip()
-                print("Transcription: ", transcription)
-                keyboard.write(transcription)
-                self.update_notification_signal.emit("Done")
+                transcription = self._transcribe_frames(profile, frames)
             except Exception as e:
-                print(f"An error occurred: {e}")
-                self.update_notification_signal.emit("Error!")
-            finally:
-                self.hide_notification_signal.emit(1000)
-                if os.path.exists(self.recorder.TEMP_FILENAME):
-                    os.remove(self.recorder.TEMP_FILENAME)
-                self.is_processing = False
+                if not is_transient_error(e):
+                    raise
+                # Keep the audio and retry in the background instead of losing it
+                print(f"Transcription failed, spooling the recording: {e}")
+                self.recorder.save()
+                self.spool.add(self.recorder.TEMP_FILENAME, {"profile": profile.name})
+                self.spool_flusher.wake()
+                self.update_notification_signal.emit("Error! Saved for retry")
+                return
+            # The API is reachable again, retry anything left in the spool now
+            self.spool_flusher.wake(reset_backoff=True)
+            print("Transcription: ", transcription)
+            if profile.output == "clipboard":
+                self.copy_to_clipboard_signal.emit(transcription)
+            else:
+                keyboard.write(transcription)
+            self._record_latency(profile, time.perf_counter() - released_at)
+            if config.ARCHIVE_ENABLED:
+                self._archive_clip(profile, frames, transcription)
+            self.update_notification_signal.emit(
+                "Done (copied)" if profile.output == "clipboard" else "Done"
+            )
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            self.update_notification_signal.emit("Error!")
+        finally:
+            if os.path.exists(self.recorder.TEMP_FILENAME):
+                os.remove(self.recorder.TEMP_FILENAME)
+            self._autotune_blocksize()
+            self.hide_notification_signal.emit(1000)
+            self.is_processing = False
+            self.activity_signal.emit()
 
     def _create_tray_icon(self) -> None:
         # Check if system tray is available
@@ -224,11 +372,15 @@ class VoiceToTextApp(QObject):
         self.settings_action = QAction("Settings")
         self.settings_action.triggered.connect(self.open_settings)
 
+        self.profile_action = QAction("Start Profiling")
+        self.profile_action.triggered.connect(self._toggle_profiling)
+
         self.quit_action = QAction("Quit")
         self.quit_action.triggered.connect(self._initiate_shutdown)
 
         # Add actions to menu
         self.tray_menu.addAction(self.settings_action)
+        self.tray_menu.addAction(self.profile_action)
         self.tray_menu.addSeparator()
         self.tray_menu.addAction(self.quit_action)
 
@@ -272,113 +424,185 @@ class VoiceToTextApp(QObject):
         """Handle when settings are saved."""
         print("Settings saved, reloading configuration...")
         reload_settings()
+        self._configure_recorder()
+        self._load_profiles()
         self._initialize_client()
         self._reregister_hotkeys()
+        # A new API key may unblock clips the spool had paused
+        self.spool_flusher.wake(reset_backoff=True)
         # Ensure tray icon stays visible
         if self.tray_icon:
             self.tray_icon.setVisible(True)
 
     def _reregister_hotkeys(self) -> None:
-        keyboard.unhook_all()
+        # The keyboard hook lives in its own process, restart it with the new chords
+        self.hotkeys.start(
+            {name: profile.shortcut for name, profile in self.profiles.items()},
+            EXIT_SHORTCUT,
+        )
 
-        try:
-            # Register recording hotkey using keyboard hook with proper press/release detection
-            self.recording_pressed = False
-            
-            def on_keyboard_event(event):
-                # Check if this is our recording hotkey combination
-                if self._is_recording_hotkey(event):
-                    if event.event_type == keyboard.KEY_DOWN:
-                        if not self.recording_pressed:
-                            self.recording_pressed = True
-                            self.start_recording()
-                        return True  # Suppress the key
-                    elif event.event_type == keyboard.KEY_UP:
-                        if self.recording_pressed:
-                            self.recording_pressed = False
-                            self.stop_recording_and_transcribe()
-                        return True  # Suppress the key
-                
-                return False  # Don't suppress other keys
-
-            # Hook the keyboard events
-            keyboard.hook(on_keyboard_event, suppress=False)
-
-            # Register exit hotkey (this one doesn't need press/release handling)
-            keyboard.add_hotkey(EXIT_SHORTCUT, self._initiate_shutdown, suppress=True)
+    def _on_hotkey_press(self, profile_name: str) -> None:
+        profile = self.profiles.get(profile_name)
+        if self.is_recording and self.active_profile is profile and self._is_hands_free(profile):
+            # A second tap ends a hands-free recording early
+            self.stop_recording_and_transcribe()
+            return
+        if self.is_recording or self.is_processing:
+            return
+        self.active_profile = profile
+        self._arm_endpointer(profile)
+        self.start_recording()
 
+    def _on_hotkey_release(self, profile_name: str) -> None:
+        # Only the chord that started the recording can stop it
+        if self.active_profile and self.active_profile.name != profile_name:
+            return
+        if self._is_hands_free(self.active_profile):
+            return
+        self.stop_recording_and_transcribe()
+
+    @staticmethod
+    def _is_hands_free(profile: Optional[DictationProfile]) -> bool:
+        return profile is not None and profile.mode == "hands_free"
+
+    def _arm_endpointer(self, profile: Optional[DictationProfile]) -> None:
+        if self._is_hands_free(profile):
+            self.recorder.endpointer = Endpointer(
+                self.recorder.rate, trailing_silence_ms=int(config.TRAILING_SILENCE_MS)
+            )
+            # Called from the audio thread (or capture reader), hop to the GUI thread
+            self.recorder.on_end_of_speech = self.end_of_speech_signal.emit
+        else:
+            self.recorder.endpointer = None
+            self.recorder.on_end_of_speech = None
+
+    def _on_end_of_speech(self) -> None:
+        if not self.is_recording:
+            return
+        endpointer = self.recorder.endpointer
+        if endpointer is not None:
             print(
-                f"Hotkeys registered: Record={START_RECORDING_SHORTCUT}, Exit={EXIT_SHORTCUT}"
+                f"End of speech at {endpointer.speech_end_time:.2f}s, "
+                f"detected at {endpointer.end_time:.2f}s"
             )
-        except Exception as e:
-            print(f"Error registering hotkeys: {e}")
-            # Try with simpler F1 key as fallback
-            self._register_fallback_hotkeys()
+        # Uploading blocks, keep it off the GUI thread
+        threading.Thread(target=self.stop_recording_and_transcribe, daemon=True).start()
+
+    def _client_for(self, profile: DictationProfile) -> Optional[Groq]:
+        with self.clients_lock:
+            client = self.clients.get(profile.name)
+            if not client:
+                # Released by idle mode, reconnect lazily
+                self._initialize_client()
+                client = self.clients.get(profile.name)
+            return client
+
+    def _transcribe_file(self, profile: DictationProfile, path: str) -> str:
+        client = self._client_for(profile)
+        if not client:
+            raise RuntimeError("API key not configured")
+        with open(path, "rb") as file:
+            transcription: str = client.audio.transcriptions.create(
+                file=(os.path.basename(path), file.read()),
+                model=profile.model,
+                response_format="text",
+                **self._profile_options(profile),
+            )  # type: ignore
+        return self._vocabulary_for(profile).apply(transcription.strip())
+
+    def _transcribe_frames(self, profile: DictationProfile, frames: List[np.ndarray]) -> str:
+        """Stream the recorder buffers to the API without writing a WAV file first."""
+        client = self._client_for(profile)
+        if not client:
+            raise RuntimeError("API key not configured")
+        fields = {"model": profile.model, "response_format": "text"}
+        fields.update(self._profile_options(profile))
+        stats = UploadStats()
+        transcription = stream_transcription(
+            client, frames, self.recorder.rate, self.recorder.channels, fields, stats
+        )
+        print(f"Upload: {stats.summary()}")
+        return self._vocabulary_for(profile).apply(transcription.strip())
 
-    def _is_recording_hotkey(self, event):
-        """Check if the keyboard event matches our recording hotkey combination."""
-        try:
-            # Parse the hotkey combination
-            hotkey_parts = START_RECORDING_SHORTCUT.lower().split('+')
-            
-            # Check if all required modifiers are pressed
-            required_modifiers = []
-            key_name = None
-            
-            for part in hotkey_parts:
-                part = part.strip()
-                if part in ['ctrl', 'control']:
-                    required_modifiers.append('ctrl')
-                elif part in ['alt']:
-                    required_modifiers.append('alt')
-                elif part in ['shift']:
-                    required_modifiers.append('shift')
-                else:
-                    key_name = part
-            
-            # Check if the event key matches
-            if event.name.lower() != key_name:
-                return False
-            
-            # Check if all required modifiers are currently pressed
-            for modifier in required_modifiers:
-                if not keyboard.is_pressed(modifier):
-                    return False
-            
-            return True
-        except Exception:
-            return False
-
-    def _register_fallback_hotkeys(self) -> None:
-        """Fallback to simpler hotkeys if combinations don't work."""
-        try:
-            print("Registering fallback hotkeys: F1 for recording, Ctrl+Alt+X for exit")
-
-            self.recording_pressed = False
-
-            def on_keyboard_event_fallback(event):
-                # Check if this is F1 key
-                if event.name.lower() == 'f1':
-                    if event.event_type == keyboard.KEY_DOWN:
-                        if not self.recording_pressed:
-                            self.recording_pressed = True
-                            self.start_recording()
-                        return True  # Suppress the key
-                    elif event.event_type == keyboard.KEY_UP:
-                        if self.recording_pressed:
-                            self.recording_pressed = False
-                            self.stop_recording_and_transcribe()
-                        return True  # Suppress the key
-                
-                return False  # Don't suppress other keys
-
-            # Hook the keyboard events for fallback
-            keyboard.hook(on_keyboard_event_fallback, suppress=False)
-            keyboard.add_hotkey("ctrl+alt+x", self._initiate_shutdown, suppress=True)
+    def _transcribe_spooled(self, entry: SpoolEntry) -> str:
+        profile = self.profiles.get(
+            entry.metadata.get("profile", ""), next(iter(self.profiles.values()))
+        )
+        return self._transcribe_file(profile, entry.audio_path)
+
+    def _deliver_spooled(self, recovered: List[Tuple[SpoolEntry, str]]) -> None:
+        # The cursor has moved on since, so recovered text goes to the clipboard, all
+        # clips of a batch at once so none of them overwrites another
+        for entry, text in recovered:
+            print(f"Recovered spooled dictation {entry.clip_id}: {text}")
+        text = "\n\n".join(text for _, text in recovered)
+        self.copy_to_clipboard_signal.emit(text)
+        if len(recovered) == 1:
+            self.tray_message_signal.emit(f"Recovered dictation copied to clipboard:\n{text}")
+        else:
+            self.tray_message_signal.emit(
+                f"{len(recovered)} recovered dictations copied to clipboard:\n{text}"
+            )
 
-        except Exception as e:
-            print(f"Even fallback hotkeys failed: {e}")
-            print("You may need to use the system tray menu to control the application")
+    def _archive_clip(
+        self, profile: DictationProfile, frames: List[np.ndarray], transcription: str
+    ) -> None:
+        if self.archive is None:
+            self.archive = ClipArchive(get_archive_dir())
+        # Copy now: ring views are reused by the next recording
+        data = np.concatenate(frames, axis=0)
+        metadata = {
+            "profile": profile.name,
+            "model": profile.model,
+            **self._profile_options(profile),
+        }
+
+        def archive() -> None:
+            try:
+                self.archive.add(data, self.recorder.rate, transcription, metadata)  # type: ignore[union-attr]
+            except Exception as e:
+                print(f"Could not archive the recording: {e}")
+
+        threading.Thread(target=archive, name="whisprly-archive", daemon=True).start()
+
+    def _show_tray_message(self, text: str) -> None:
+        if self.tray_icon:
+            self.tray_icon.showMessage("Whisprly", text)
+
+    def _load_profiles(self) -> None:
+        self.profiles = {profile.name: profile for profile in config.PROFILES}
+        for name in self.profiles:
+            self.profile_latency.setdefault(name, Histogram())
+
+    @staticmethod
+    def _profile_options(profile: DictationProfile) -> Dict[str, str]:
+        """Optional request fields; a pinned language skips auto-detection."""
+        options: Dict[str, str] = {}
+        if profile.language:
+            options["language"] = profile.language
+        if profile.prompt:
+            options["prompt"] = profile.prompt
+        return options
+
+    def _vocabulary_for(self, profile: DictationProfile) -> Vocabulary:
+        path = profile.vocabulary or get_vocabulary_file_path()
+        vocabulary = self.vocabularies.get(path)
+        if vocabulary is None:
+            vocabulary = self.vocabularies[path] = Vocabulary(path)
+        return vocabulary
+
+    def _record_latency(self, profile: DictationProfile, seconds: float) -> None:
+        histogram = self.profile_latency.setdefault(profile.name, Histogram())
+        histogram.record(seconds * 1e6)
+        print(
+            f"[{profile.name}] release-to-text latency {seconds * 1000:.0f} ms "
+            f"({histogram.summary()})"
+        )
+
+    def _copy_to_clipboard(self, text: str) -> None:
+        clipboard = self.app.clipboard()
+        if clipboard:
+            clipboard.setText(text)
 
     def _get_icon_path(self) -> str:
         # Determine the path to the icon file, considering PyInstaller's behavior
@@ -403,10 +627,70 @@ class VoiceToTextApp(QObject):
         # Return a default system icon if no custom icon is found
         return ""
 
+    def _toggle_profiling(self) -> None:
+        if self.profiler.running:
+            self._stop_profiling()
+        else:
+            self._start_profiling()
+
+    def _start_profiling(self, duration: Optional[float] = None) -> None:
+        self.profiler.start(duration)
+        if self.tray_menu:
+            self.profile_action.setText("Stop Profiling")
+        print(
+            "Profiling started"
+            + (f" for {duration:g}s" if duration else "")
+            + "..."
+        )
+
+    def _stop_profiling(self) -> None:
+        # Writing the files happens on the profiler thread, finished signal follows
+        self.profiler.stop()
+
+    def _on_profiling_finished(self, pstats_path: str) -> None:
+        if self.tray_menu:
+            self.profile_action.setText("Start Profiling")
+        if self.tray_icon:
+            self.tray_icon.showMessage(
+                "Whisprly", f"Profile saved to {os.path.dirname(pstats_path)}"
+            )
+
+    def _handle_control_command(self, command: str) -> str:
+        """Handle a command received on the control socket (runs on the GUI thread)."""
+        parts = command.split()
+        if parts[:2] == ["profile", "start"]:
+            if self.profiler.running:
+                return "profiler already running"
+            duration = float(parts[2]) if len(parts) > 2 else None
+            self._start_profiling(duration)
+            return f"profiling, output in {self.profiler.output_dir}"
+        if parts[:2] == ["profile", "stop"]:
+            if not self.profiler.running:
+                return "profiler not running"
+            self._stop_profiling()
+            return f"profile saved in {self.profiler.output_dir}"
+        if parts[:2] == ["profile", "status"]:
+            return "running" if self.profiler.running else "stopped"
+        if parts[:2] == ["hotkeys", "stats"]:
+            return self.hotkeys.latency_summary()
+        if parts[:2] == ["audio", "stats"]:
+            return (
+                f"blocksize={self.recorder.blocksize or 'default'} "
+                f"latency={self.recorder.latency}, last recording: "
+                f"{self.recorder.stats.summary()}"
+            )
+        if parts[:2] == ["dictation", "stats"]:
+            return "; ".join(
+                f"{name}: {histogram.summary()}"
+                for name, histogram in self.profile_latency.items()
+            )
+        return f"unknown command: {command}"
+
     def _initiate_shutdown(self) -> None:
         print("\nShutdown initiated...")
         # This method is safe to call from any thread.
-        keyboard.unhook_all()
+        print(f"Hotkey hook latency per keystroke: {self.hotkeys.latency_summary()}")
+        self.hotkeys.stop()
         self.shutdown_signal.emit()
 
     def _perform_shutdown(self) -> None:
@@ -414,7 +698,15 @@ class VoiceToTextApp(QObject):
         # This method will be executed on the main GUI thread.
         if self.notification:
             self.notification.close()
-        self.overlay.close()
+        if self.overlay:
+            self.overlay.close()
+        self.recorder.close()
+
+        self.spool_flusher.stop()
+        self.device_manager.stop()
+        if self.profiler.running:
+            self.profiler.stop()
+        self.control_server.close()
 
         # Hide the tray icon before quitting
         if self.tray_icon:
@@ -446,14 +738,183 @@ class VoiceToTextApp(QObject):
             else:
                 self.notification.hide_animated()
 
+    def _show_overlay(self) -> None:
+        # The overlay may have been destroyed by idle mode, recreate it lazily
+        if self.overlay is None:
+            self.overlay = OverlayWidget()
+        self.overlay.show_overlay()
+
+    def _restart_idle_timer(self) -> None:
+        if config.IDLE_TIMEOUT_SECONDS:
+            self.idle_timer.start(int(config.IDLE_TIMEOUT_SECONDS * 1000))
+        else:
+            self.idle_timer.stop()
+
+    def _enter_idle_mode(self) -> None:
+        """Release heavy resources after a quiet period; they are restored on next use."""
+        if self.is_recording or self.is_processing or self.is_idle:
+            return
+
+        rss_before = get_rss_mb()
+        # Pooled HTTP connections of the Groq clients
+        with self.clients_lock:
+            if self.spool_flusher.busy:
+                # Spooled clips are being retried with these clients, try again later
+                self._restart_idle_timer()
+                return
+            self._close_clients()
+
+        self.is_idle = True
+        self.device_manager.suspend()
+
+        # Captured audio from the last dictation
+        self.recorder.release()
+
+        # Hidden widgets
+        if self.overlay is not None and not self.overlay.isVisible():
+            self.overlay.deleteLater()
+            self.overlay = None
+        if self.notification is not None and not self.notification.isVisible():
+            self.notification.deleteLater()
+            self.notification = None
+
+        # deleteLater() only runs once control returns to the event loop
+        QTimer.singleShot(0, lambda: self._trim_memory(rss_before))
+
+    def _trim_memory(self, rss_before: float) -> None:
+        gc.collect()
+        trim_process_memory()
+        # The capture and hotkey helpers stay alive in idle mode, report them too
+        print(
+            f"Idle mode: RSS {rss_before:.1f} MiB -> {get_rss_mb():.1f} MiB, "
+            f"helper processes {get_children_rss_mb():.1f} MiB"
+        )
+        self.wakeup_meter.start()
+        QTimer.singleShot(WAKEUP_SAMPLE_MS, self._report_idle_wakeups)
+
+    def _report_idle_wakeups(self) -> None:
+        if self.is_idle:
+            print(f"Idle wakeups: {self.wakeup_meter.rate():.1f}/s")
+
+    def _install_signal_handlers(self) -> None:
+        """Deliver SIGINT through a wakeup socket so Ctrl+C works without a polling timer."""
+        self._signal_reader, self._signal_writer = socket.socketpair()
+        self._signal_reader.setblocking(False)
+        self._signal_writer.setblocking(False)
+        # The C-level handler writes to this socket, which wakes up the Qt event loop
+        signal.set_wakeup_fd(self._signal_writer.fileno())
+        signal.signal(signal.SIGINT, lambda sig, frame: self._initiate_shutdown())
+
+        self.signal_notifier = QSocketNotifier(
+            self._signal_reader.fileno(), QSocketNotifier.Type.Read
+        )
+        self.signal_notifier.activated.connect(self._drain_signal_socket)
+
+    def _drain_signal_socket(self) -> None:
+        # Returning to Python here lets the interpreter run the pending signal handler
+        try:
+            while self._signal_reader.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
     def _initialize_client(self) -> None:
-        """Initialize the Groq client with the current API key."""
-        global client
-        api_key = load_api_key()
-        if api_key:
-            client = Groq(api_key=api_key)
+        """Create one warm Groq client per dictation profile with the current API key."""
+        with self.clients_lock:
+            self._close_clients()
+            for name in self.profiles:
+                client = create_client()
+                if client is None:
+                    break
+                self.clients[name] = client
+                # Open the TLS connection now rather than on the first dictation
+                threading.Thread(
+                    target=self._warm_up_client, args=(client,), daemon=True
+                ).start()
+
+    @staticmethod
+    def _warm_up_client(client: Groq) -> None:
+        try:
+            client.models.list()
+        except Exception as e:
+            print(f"Could not warm up the API connection: {e}")
+
+    def _close_clients(self) -> None:
+        with self.clients_lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients = {}
+
+    def _configure_recorder(self) -> None:
+        """Apply the audio stream settings to the recorder."""
+        backend = ProcessAudioRecorder if config.AUDIO_BACKEND == "process" else AudioRecorder
+        if not isinstance(self.recorder, backend) and not self.is_recording:
+            self.recorder.close()
+            self.recorder = backend(TEMP_FILENAME, SAMPLE_RATE, CHANNELS)
+
+        self.recorder.latency = config.AUDIO_LATENCY
+        if isinstance(self.recorder, AudioRecorder):
+            self.recorder.dtype = config.AUDIO_DTYPE
+        self.device_manager.set_preferred(config.AUDIO_DEVICE)
+        self.device_manager.rescan_seconds = config.DEVICE_RESCAN_SECONDS
+        self._apply_device()
+
+        if config.AUDIO_BLOCKSIZE != "auto":
+            self.recorder.blocksize = int(config.AUDIO_BLOCKSIZE)
+            return
+
+        # Auto-tuned once per machine, after the first recording, see _autotune_blocksize()
+        self.recorder.latency = "low"
+        self.recorder.blocksize = int(config.AUDIO_TUNED_BLOCKSIZE)
+
+    def _stream_open(self) -> bool:
+        """Whether an input stream is open in this process (the capture process has its own)."""
+        return isinstance(self.recorder, AudioRecorder) and self.recorder.stream is not None
+
+    def _apply_device(self) -> None:
+        """Point the recorder at the device picked by the device manager."""
+        if isinstance(self.recorder, ProcessAudioRecorder):
+            # The capture process has its own PortAudio instance, indices may differ
+            self.recorder.device = self.device_manager.current_spec
         else:
-            client = None
+            self.recorder.device = self.device_manager.current_index
+
+    def _autotune_blocksize(self) -> None:
+        """Probe blocksizes once the microphone is known to work.
+
+        Runs on the transcription worker while is_processing is still set, so no
+        recording can start meanwhile.
+        """
+        if (
+            config.AUDIO_BLOCKSIZE != "auto"
+            or config.AUDIO_TUNED_BLOCKSIZE
+            or self._autotune_attempted
+        ):
+            return
+        self._autotune_attempted = True
+        print("Auto-tuning audio blocksize...")
+        self.update_notification_signal.emit("Tuning audio...")
+        try:
+            # The probe streams must not overlap a PortAudio rescan either
+            with self.device_manager.lock:
+                blocksize = autotune_blocksize(
+                    self.recorder.rate,
+                    self.recorder.channels,
+                    dtype=self.recorder.dtype,
+                    device=self.recorder.device,
+                )
+            if blocksize is None:
+                # Try again after the next start rather than storing a made-up value
+                print("Audio blocksize auto-tuning failed, keeping the host default")
+                return
+            print(f"Selected audio blocksize: {blocksize}")
+            self.recorder.blocksize = blocksize
+            settings = load_settings()
+            settings["AUDIO_TUNED_BLOCKSIZE"] = blocksize
+            save_settings(settings)
+            config.AUDIO_TUNED_BLOCKSIZE = blocksize
+        except Exception as e:
+            print(f"Audio blocksize auto-tuning failed: {e}")
 
     def _check_api_key_on_startup(self) -> None:
         """Check if API key is available and show settings when appropriate."""
@@ -478,6 +939,7 @@ class VoiceToTextApp(QObject):
                 self._initiate_shutdown()
             else:
                 self._initialize_client()
+                self.spool_flusher.wake(reset_backoff=True)
                 print("API key configured successfully!")
 
         # Only connect the shutdown logic for the API key required dialog
@@ -487,6 +949,9 @@ class VoiceToTextApp(QObject):
         settings_window.activateWindow()
 
     def run(self) -> None:
+        self._install_signal_handlers()
+        self.control_server.listen()
+
         # Create tray icon first to ensure it's always visible
         self._create_tray_icon()
 
@@ -498,7 +963,11 @@ class VoiceToTextApp(QObject):
             self.tray_icon.setVisible(True)
             print(f"Tray icon final visibility: {self.tray_icon.isVisible()}")
 
-        print(f"Press and hold '{START_RECORDING_SHORTCUT}' to record.")
+        for profile in self.profiles.values():
+            print(f"Press and hold '{profile.shortcut}' to record ({profile.name}).")
         print(f"Press '{EXIT_SHORTCUT}' to exit.")
         self._reregister_hotkeys()
+        self._restart_idle_timer()
+        self.spool_flusher.start()
+        self.device_manager.start()
         self.app.exec()
@@ -0,0 +1,181 @@
+import difflib
+import io
+import json
+import os
+import struct
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import soundfile as sf
+from groq import Groq
+
+from .vad import normalize_samples, trim_silence
+
+SEGMENT_FILENAME: str = "clips.seg"
+INDEX_FILENAME: str = "clips.idx"
+# Whisper works on 16 kHz audio, storing more would only take space
+ARCHIVE_RATE: int = 16000
+RECORD_MAGIC: bytes = b"WCLP"
+RECORD_HEADER = struct.Struct("<4sI")
+
+
+class ClipArchive:
+    """Append-only archive of trimmed dictation clips.
+
+    Clips are stored as 16 kHz mono FLAC records in a single segment file; an index
+    file maps each clip id to its offset and length along with the original
+    transcript, so a time range can be read back with sequential I/O.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory: str = directory
+        self.segment_path: str = os.path.join(directory, SEGMENT_FILENAME)
+        self.index_path: str = os.path.join(directory, INDEX_FILENAME)
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def add(
+        self,
+        data: np.ndarray,
+        rate: int,
+        transcript: str,
+        metadata: Optional[dict] = None,
+    ) -> Optional[str]:
+        """Compress and append a recording; return its clip id, or None if silent."""
+        # Only needed when archiving, keep it off the startup path
+        from scipy.signal import resample_poly
+
+        trimmed = trim_silence(normalize_samples(data), rate)
+        if not len(trimmed):
+            return None
+        target_rate = min(ARCHIVE_RATE, rate)
+        divisor = int(np.gcd(target_rate, rate))
+        resampled = resample_poly(trimmed, target_rate // divisor, rate // divisor)
+
+        buffer = io.BytesIO()
+        sf.write(
+            buffer, np.clip(resampled, -1.0, 1.0), target_rate, format="FLAC", subtype="PCM_16"
+        )
+        payload = buffer.getvalue()
+        clip_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+
+        with self.lock:
+            with open(self.segment_path, "ab") as segment:
+                offset = segment.seek(0, os.SEEK_END)
+                segment.write(RECORD_HEADER.pack(RECORD_MAGIC, len(payload)))
+                segment.write(payload)
+                segment.flush()
+                os.fsync(segment.fileno())
+
+            # The index line is written last: a crash can only leave unreferenced bytes
+            entry = dict(metadata or {})
+            entry.update(
+                id=clip_id,
+                created=time.time(),
+                offset=offset + RECORD_HEADER.size,
+                length=len(payload),
+                duration=round(len(resampled) / target_rate, 2),
+                transcript=transcript,
+            )
+            with open(self.index_path, "a", encoding="utf-8") as index:
+                index.write(json.dumps(entry) + "\n")
+                index.flush()
+                os.fsync(index.fileno())
+        return clip_id
+
+    def entries(self, since: float = 0.0, until: Optional[float] = None) -> List[dict]:
+        """Index entries created in [since, until), in segment order."""
+        if not os.path.exists(self.index_path):
+            return []
+        entries: List[dict] = []
+        with open(self.index_path, "r", encoding="utf-8") as index:
+            for line in index:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line after a crash
+                    continue
+                created = entry.get("created", 0.0)
+                if created >= since and (until is None or created < until):
+                    entries.append(entry)
+        entries.sort(key=lambda entry: entry["offset"])
+        return entries
+
+    def read(self, entries: Sequence[dict]) -> Iterator[Tuple[dict, bytes]]:
+        """Yield (entry, FLAC bytes) reading the segment file front to back."""
+        with open(self.segment_path, "rb") as segment:
+            for entry in sorted(entries, key=lambda entry: entry["offset"]):
+                if segment.tell() != entry["offset"]:
+                    segment.seek(entry["offset"])
+                yield entry, segment.read(entry["length"])
+
+
+def _similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a.lower().split(), b.lower().split()).ratio()
+
+
+def retranscribe(
+    archive: ClipArchive,
+    client: Groq,
+    fields: Dict[str, str],
+    since: float = 0.0,
+    until: Optional[float] = None,
+    concurrency: int = 4,
+    postprocess: Callable[[str], str] = str.strip,
+) -> str:
+    """Transcribe archived clips again and compare the results with the originals.
+
+    Clips are read in segment order and uploaded as stored, up to concurrency
+    requests at a time; fields holds the model and the other request options.
+    """
+    entries = archive.entries(since, until)
+    if not entries:
+        return "No archived clips in this time range"
+
+    def transcribe(entry: dict, payload: bytes) -> str:
+        text: str = client.audio.transcriptions.create(
+            file=(f"{entry['id']}.flac", payload), response_format="text", **fields
+        )  # type: ignore
+        return postprocess(text.strip())
+
+    started = time.perf_counter()
+    similarities: List[float] = []
+    changed = 0
+    failed = 0
+    # Bounds how far reading gets ahead of the uploads, so a large range is never
+    # held in memory at once
+    read_ahead = threading.BoundedSemaphore(concurrency * 2)
+    futures = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for entry, payload in archive.read(entries):
+            read_ahead.acquire()
+            future = executor.submit(transcribe, entry, payload)
+            future.add_done_callback(lambda _: read_ahead.release())
+            futures.append((entry, future))
+        for entry, future in futures:
+            try:
+                text = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"{entry['id']}: failed: {e}")
+                continue
+            original = entry.get("transcript", "")
+            similarity = _similarity(original, text)
+            similarities.append(similarity)
+            if text != original:
+                changed += 1
+                print(f"{entry['id']} ({similarity:.0%} similar)\n  - {original}\n  + {text}")
+
+    elapsed = time.perf_counter() - started
+    audio_seconds = sum(entry.get("duration", 0.0) for entry in entries)
+    summary = (
+        f"{len(entries)} clips ({audio_seconds:.0f}s of audio) in {elapsed:.1f}s, "
+        f"{changed} changed, {failed} failed"
+    )
+    if similarities:
+        summary += f", mean word similarity {np.mean(similarities):.1%}"
+    return summary
@@ -1,46 +1,182 @@
-import threading
-from typing import List, Optional
+import time
+from typing import Callable, List, Optional, Sequence, Union
 
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
 from sounddevice import CallbackFlags
 
+from .metrics import Histogram
+from .vad import Endpointer
+
+AUTOTUNE_BLOCKSIZES: Sequence[int] = (64, 128, 256, 512, 1024, 2048, 4096)
+
+
+class AudioStats:
+    """Health counters for the input stream callback."""
+
+    def __init__(self) -> None:
+        self.overflows: int = 0
+        self.underflows: int = 0
+        self.callbacks: int = 0
+        self.callback_duration = Histogram()
+        self.callback_jitter = Histogram()
+        self._last_callback: Optional[float] = None
+
+    def reset(self) -> None:
+        self.overflows = 0
+        self.underflows = 0
+        self.callbacks = 0
+        self.callback_duration.reset()
+        self.callback_jitter.reset()
+        self._last_callback = None
+
+    def summary(self) -> str:
+        return (
+            f"callbacks={self.callbacks} overflows={self.overflows} "
+            f"underflows={self.underflows}\n"
+            f"  duration: {self.callback_duration.summary()}\n"
+            f"  jitter:   {self.callback_jitter.summary()}"
+        )
+
 
 class AudioRecorder:
-    def __init__(self, TEMP_FILENAME: str, rate: int, channels: int) -> None:
+    def __init__(
+        self,
+        TEMP_FILENAME: str,
+        rate: int,
+        channels: int,
+        blocksize: int = 0,
+        latency: Union[str, float] = "high",
+        dtype: str = "float32",
+        device: Optional[Union[int, str]] = None,
+    ) -> None:
         self.TEMP_FILENAME: str = TEMP_FILENAME
         self.rate: int = rate
         self.channels: int = channels
+        self.blocksize: int = blocksize
+        self.latency: Union[str, float] = latency
+        self.dtype: str = dtype
+        self.device: Optional[Union[int, str]] = device
         self.recording: bool = False
         self.frames: List[np.ndarray] = []
-        self.thread: Optional[threading.Thread] = None
+        self.stream: Optional[sd.InputStream] = None
+        self.stats = AudioStats()
+        # Hands-free mode: called once, from the audio thread, at the end of speech
+        self.endpointer: Optional[Endpointer] = None
+        self.on_end_of_speech: Optional[Callable[[], None]] = None
 
     def start(self) -> None:
         self.recording = True
         self.frames = []
-        self.thread = threading.Thread(target=self._record)
-        self.thread.start()
-
-    def _record(self) -> None:
-        with sd.InputStream(
-            samplerate=self.rate, channels=self.channels, callback=self.callback
-        ):
-            while self.recording:
-                sd.sleep(100)
+        self.stats.reset()
+        # PortAudio drives the callback from its own thread, nothing to poll here
+        self.stream = sd.InputStream(
+            samplerate=self.rate,
+            channels=self.channels,
+            blocksize=self.blocksize,
+            latency=self.latency,
+            dtype=self.dtype,
+            device=self.device,
+            callback=self.callback,
+        )
+        self.stream.start()
 
-    def callback(self, indata: np.ndarray, frames: int, time, status: CallbackFlags) -> None:
+    def callback(self, indata: np.ndarray, frames: int, time_info, status: CallbackFlags) -> None:
+        started = time.perf_counter()
+        stats = self.stats
         if status:
-            print(status)
-        self.frames.append(indata.copy())
+            if status.input_overflow:
+                stats.overflows += 1
+            if status.input_underflow:
+                stats.underflows += 1
+        if stats._last_callback is not None:
+            # Deviation between the actual and the nominal callback period
+            expected = frames / self.rate
+            stats.callback_jitter.record(abs(started - stats._last_callback - expected) * 1e6)
+        stats._last_callback = started
+        stats.callbacks += 1
+
+        block = indata.copy()
+        self.frames.append(block)
+        endpointer = self.endpointer
+        if endpointer is not None and not endpointer.ended and endpointer.process(block):
+            if self.on_end_of_speech:
+                self.on_end_of_speech()
+
+        stats.callback_duration.record((time.perf_counter() - started) * 1e6)
 
     def stop(self) -> None:
         self.recording = False
-        if self.thread:
-            self.thread.join()
+        if self.stream:
+            # stop() waits for pending buffers to be delivered to the callback
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        print(f"Audio stream health: {self.stats.summary()}")
 
     def save(self) -> None:
         if not self.frames:
             return
         recording_data: np.ndarray = np.concatenate(self.frames, axis=0)
         sf.write(self.TEMP_FILENAME, recording_data, self.rate)
+
+    def release(self) -> None:
+        """Drop the audio captured by the last recording."""
+        self.frames = []
+
+    def close(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+
+def autotune_blocksize(
+    rate: int,
+    channels: int,
+    dtype: str = "float32",
+    device: Optional[Union[int, str]] = None,
+    latency: Union[str, float] = "low",
+    candidates: Sequence[int] = AUTOTUNE_BLOCKSIZES,
+    seconds: float = 1.0,
+) -> Optional[int]:
+    """Return the smallest blocksize that captures without overflows on this machine.
+
+    Returns None when no candidate could record at all, e.g. without an input device.
+    """
+    recorded = False
+    for blocksize in sorted(candidates):
+        overflows = 0
+        callbacks = 0
+
+        def callback(indata: np.ndarray, frames: int, time_info, status: CallbackFlags) -> None:
+            nonlocal overflows, callbacks
+            callbacks += 1
+            if status.input_overflow:
+                overflows += 1
+            # Mimic the per-block work of AudioRecorder.callback
+            indata.copy()
+
+        try:
+            with sd.InputStream(
+                samplerate=rate,
+                channels=channels,
+                blocksize=blocksize,
+                latency=latency,
+                dtype=dtype,
+                device=device,
+                callback=callback,
+            ):
+                sd.sleep(int(seconds * 1000))
+        except Exception as e:
+            print(f"Blocksize {blocksize} not supported: {e}")
+            continue
+
+        print(f"Blocksize {blocksize}: {callbacks} callbacks, {overflows} overflows")
+        if callbacks and not overflows:
+            return blocksize
+        if callbacks:
+            recorded = True
+
+    # Every blocksize overflowed: the largest one is still the safest choice
+    return max(candidates) if recorded else None
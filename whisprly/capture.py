@@ -0,0 +1,370 @@
+import multiprocessing
+import os
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Connection
+from typing import Callable, List, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from .audio import AudioStats
+from .vad import Endpointer
+
+# Header slots (int64) at the start of the shared memory block
+WRITE_POS: int = 0  # total frames ever written
+OVERFLOWS: int = 1  # PortAudio input overflows seen by the capture process
+HEADER_SLOTS: int = 4
+HEADER_BYTES: int = HEADER_SLOTS * 8
+
+# How often the capture process reports its write position while recording
+NOTIFY_SECONDS: float = 0.25
+# Finer reports in hands-free mode, they bound the endpointer's reaction time
+ENDPOINTER_NOTIFY_SECONDS: float = 0.04
+# Longest wait for the capture process to acknowledge a start or stop
+REPLY_TIMEOUT_SECONDS: float = 5.0
+
+
+class SharedRingBuffer:
+    """float32 sample ring in shared memory, written by one process and read by another."""
+
+    def __init__(
+        self,
+        capacity: int,
+        channels: int,
+        name: Optional[str] = None,
+        create: bool = True,
+    ) -> None:
+        self.capacity: int = capacity
+        self.channels: int = channels
+        size = HEADER_BYTES + capacity * channels * 4
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.shm.buf)
+        self.data = np.ndarray(
+            (capacity, channels), dtype=np.float32, buffer=self.shm.buf, offset=HEADER_BYTES
+        )
+        if create:
+            self.header[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def write_pos(self) -> int:
+        return int(self.header[WRITE_POS])
+
+    def write(self, block: np.ndarray) -> None:
+        position = int(self.header[WRITE_POS])
+        frames = len(block)
+        index = position % self.capacity
+        first = min(frames, self.capacity - index)
+        self.data[index:index + first] = block[:first]
+        if first < frames:
+            self.data[:frames - first] = block[first:]
+        # Publish the new position only once the samples are in place
+        self.header[WRITE_POS] = position + frames
+
+    def views(self, start: int, end: int) -> List[np.ndarray]:
+        """Zero-copy views over frames [start, end); valid until the writer wraps around."""
+        if end - start > self.capacity:
+            raise ValueError("Requested range was overwritten by the writer")
+        if end <= start:
+            return []
+        first_index = start % self.capacity
+        last_index = end % self.capacity
+        if first_index < last_index or last_index == 0:
+            return [self.data[first_index:first_index + (end - start)]]
+        return [self.data[first_index:], self.data[:last_index]]
+
+    def close(self) -> None:
+        # Drop our numpy views first, SharedMemory refuses to close while exported
+        del self.header
+        del self.data
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a view, the mapping goes away with it
+            pass
+
+
+def _run_capture(conn: Connection, ring_name: str, capacity: int, channels: int) -> None:
+    """Entry point of the capture process: run the input stream and fill the ring."""
+    import sounddevice as sd
+
+    ring = SharedRingBuffer(capacity, channels, name=ring_name, create=False)
+    if os.name == "posix":
+        # The block is owned and unlinked by the app, not by this process
+        resource_tracker.unregister(ring.shm._name, "shared_memory")  # type: ignore[attr-defined]
+    send_lock = threading.Lock()
+    stream: Optional[sd.InputStream] = None
+    notify_every = 0
+    last_notified = 0
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            conn.send(message)
+
+    def callback(indata: np.ndarray, frames: int, time_info, status) -> None:
+        nonlocal last_notified
+        if status.input_overflow:
+            ring.header[OVERFLOWS] += 1
+        ring.write(indata)
+        position = ring.write_pos
+        if position - last_notified >= notify_every:
+            last_notified = position
+            send(("progress", position))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        kind = message[0]
+        if kind == "start":
+            options = message[1]
+            notify_every = int(options["samplerate"] * options.pop("notify_seconds"))
+            last_notified = ring.write_pos
+            for attempt in range(2):
+                try:
+                    stream = sd.InputStream(
+                        channels=channels, dtype="float32", callback=callback, **options
+                    )
+                    stream.start()
+                    send(("started", ring.write_pos))
+                    break
+                except Exception as e:
+                    stream = None
+                    if attempt:
+                        send(("error", str(e)))
+                    else:
+                        # The device may have been plugged in after this process
+                        # enumerated devices, rescan once and retry
+                        sd._terminate()
+                        sd._initialize()
+        elif kind == "stop":
+            if stream is not None:
+                stream.stop()
+                stream.close()
+                stream = None
+            send(("stopped", ring.write_pos))
+        elif kind == "exit":
+            break
+
+    if stream is not None:
+        stream.close()
+    ring.close()
+
+
+class ProcessAudioRecorder:
+    """Recorder whose input stream runs in a separate process.
+
+    The PortAudio callback never competes with the app for the GIL; samples reach
+    the app through a shared-memory ring that is read in place.
+    """
+
+    def __init__(
+        self,
+        TEMP_FILENAME: str,
+        rate: int,
+        channels: int,
+        blocksize: int = 0,
+        latency: Union[str, float] = "high",
+        device: Optional[Union[int, str]] = None,
+        ring_seconds: float = 120.0,
+    ) -> None:
+        self.TEMP_FILENAME: str = TEMP_FILENAME
+        self.rate: int = rate
+        self.channels: int = channels
+        self.blocksize: int = blocksize
+        self.latency: Union[str, float] = latency
+        # The ring always holds float32 samples
+        self.dtype: str = "float32"
+        self.device: Optional[Union[int, str]] = device
+        self.ring_seconds: float = ring_seconds
+        self.recording: bool = False
+        self.stats = AudioStats()
+        self.ring: Optional[SharedRingBuffer] = None
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Optional[Connection] = None
+        self.reader: Optional[threading.Thread] = None
+        self.start_pos: int = 0
+        self.end_pos: int = 0
+        # Frames copied out of the ring before the writer could overwrite them
+        self.spilled: List[np.ndarray] = []
+        self.spilled_until: int = 0
+        self._overflows_at_start: int = 0
+        self._reply = threading.Event()
+        self._error: Optional[str] = None
+        # Hands-free mode: the endpointer reads new frames in place from the ring
+        self.endpointer: Optional[Endpointer] = None
+        self.on_end_of_speech: Optional[Callable[[], None]] = None
+        self.endpointed_until: int = 0
+
+    def _ensure_process(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            return
+        self.close()
+        capacity = int(self.rate * self.ring_seconds)
+        self.ring = SharedRingBuffer(capacity, self.channels)
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_run_capture,
+            args=(child_conn, self.ring.name, capacity, self.channels),
+            name="whisprly-capture",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.reader = threading.Thread(
+            target=self._read, args=(parent_conn,), name="whisprly-capture-reader", daemon=True
+        )
+        self.reader.start()
+
+    def _read(self, conn: Connection) -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                # The process exited or crashed, fail any pending request now
+                self._error = "Capture process exited"
+                self._reply.set()
+                break
+            kind = message[0]
+            if kind == "progress":
+                self._run_endpointer(message[1])
+                self._spill(message[1])
+            elif kind == "started":
+                self._reply.set()
+            elif kind == "stopped":
+                self.end_pos = message[1]
+                self._reply.set()
+            elif kind == "error":
+                self._error = message[1]
+                self._reply.set()
+
+    def _run_endpointer(self, position: int) -> None:
+        endpointer = self.endpointer
+        if not self.recording or endpointer is None or endpointer.ended or self.ring is None:
+            return
+        for view in self.ring.views(self.endpointed_until, position):
+            if endpointer.process(view):
+                if self.on_end_of_speech:
+                    self.on_end_of_speech()
+                break
+        self.endpointed_until = position
+
+    def _spill(self, position: int) -> None:
+        """Copy out frames that are about to be overwritten during long recordings."""
+        if not self.recording or self.ring is None:
+            return
+        keep = self.ring.capacity // 2
+        if position - self.spilled_until <= keep:
+            return
+        until = position - keep
+        for view in self.ring.views(self.spilled_until, until):
+            self.spilled.append(view.copy())
+        self.spilled_until = until
+
+    def _request(self, message: tuple) -> None:
+        assert self.conn is not None
+        self._reply.clear()
+        self._error = None
+        self.conn.send(message)
+        if not self._reply.wait(REPLY_TIMEOUT_SECONDS):
+            raise TimeoutError(f"Capture process did not answer {message[0]!r}")
+        if self._error:
+            raise RuntimeError(self._error)
+
+    def start(self) -> None:
+        self._ensure_process()
+        assert self.ring is not None
+        self.spilled = []
+        self.stats.reset()
+        self._overflows_at_start = int(self.ring.header[OVERFLOWS])
+        # The capture process only writes while recording, so this is stable
+        self.start_pos = self.end_pos = self.spilled_until = self.ring.write_pos
+        self.endpointed_until = self.start_pos
+        self.recording = True
+        try:
+            self._request((
+                "start",
+                {
+                    "samplerate": self.rate,
+                    "blocksize": self.blocksize,
+                    "latency": self.latency,
+                    "device": self.device,
+                    "notify_seconds": (
+                        ENDPOINTER_NOTIFY_SECONDS if self.endpointer else NOTIFY_SECONDS
+                    ),
+                },
+            ))
+        except Exception:
+            self.recording = False
+            raise
+
+    def stop(self) -> None:
+        if not self.recording or self.conn is None or self.ring is None:
+            return
+        try:
+            self._request(("stop",))
+        except Exception as e:
+            # Keep whatever reached the ring before the process stopped answering
+            print(f"Capture process failed to stop: {e}")
+            self.end_pos = self.ring.write_pos
+            if self.process is not None and self.process.is_alive():
+                # Hung: the next start() spawns a fresh process
+                self.process.terminate()
+        self.recording = False
+        self.stats.overflows = int(self.ring.header[OVERFLOWS]) - self._overflows_at_start
+        print(
+            f"Capture process: {self.end_pos - self.start_pos} frames, "
+            f"{self.stats.overflows} overflows, {len(self.spilled)} spilled chunks"
+        )
+
+    @property
+    def frames(self) -> List[np.ndarray]:
+        """Recorded audio as a list of arrays, mostly zero-copy views into the ring."""
+        if self.ring is None:
+            return []
+        return self.spilled + self.ring.views(self.spilled_until, self.end_pos)
+
+    def save(self) -> None:
+        frames = self.frames
+        if not frames:
+            return
+        # Write chunk by chunk so the ring views are encoded in place
+        with sf.SoundFile(
+            self.TEMP_FILENAME, "w", samplerate=self.rate, channels=self.channels
+        ) as f:
+            for chunk in frames:
+                f.write(chunk)
+
+    def release(self) -> None:
+        """Drop recorded audio; the idle capture process is kept ready for the next start()."""
+        self.spilled = []
+        self.start_pos = self.end_pos = self.spilled_until = 0
+
+    def close(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.send(("exit",))
+            except (OSError, ValueError):
+                pass
+        if self.process is not None:
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.reader is not None:
+            self.reader.join(timeout=2)
+            self.reader = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring.shm.unlink()
+            self.ring = None
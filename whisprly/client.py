@@ -0,0 +1,39 @@
+import weakref
+from typing import Optional
+
+import httpx
+from groq import Groq
+
+from .config import load_api_key
+
+# Connections are kept warm between dictations; idle mode closes them explicitly
+MAX_CONNECTIONS: int = 10
+MAX_KEEPALIVE_CONNECTIONS: int = 5
+KEEPALIVE_EXPIRY: float = 300.0
+TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# The pooled HTTP client behind each Groq client, for requests the SDK cannot make
+_http_clients: "weakref.WeakKeyDictionary[Groq, httpx.Client]" = weakref.WeakKeyDictionary()
+
+
+def create_client(api_key: Optional[str] = None, max_connections: int = MAX_CONNECTIONS) -> Optional[Groq]:
+    """Create a Groq client backed by a pooled HTTP client, or None without an API key."""
+    api_key = api_key or load_api_key()
+    if not api_key:
+        return None
+    http_client = httpx.Client(
+        timeout=TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(MAX_KEEPALIVE_CONNECTIONS, max_connections),
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+    client = Groq(api_key=api_key, http_client=http_client)
+    _http_clients[client] = http_client
+    return client
+
+
+def get_http_client(client: Groq) -> httpx.Client:
+    """The pooled HTTP client a Groq client from create_client() sends its requests with."""
+    return _http_clients[client]
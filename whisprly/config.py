@@ -4,11 +4,35 @@ import sys
 import base64
 
 
+DEFAULT_MODEL = "whisper-large-v3-turbo"
+
+
 class Settings:
     def __init__(self):
         self.GROQ_API_KEY: str = ""
 
 
+class DictationProfile:
+    """A push-to-talk chord with its own transcription options."""
+
+    def __init__(self, name: str, shortcut: str, language: str = "", prompt: str = "",
+                 vocabulary: str = "", model: str = DEFAULT_MODEL, output: str = "type",
+                 mode: str = "push_to_talk"):
+        self.name: str = name
+        self.shortcut: str = shortcut
+        # Pinning the language skips Whisper's auto-detection
+        self.language: str = language
+        self.prompt: str = prompt
+        # Path to a vocabulary file, empty for the default vocabulary.json
+        self.vocabulary: str = vocabulary
+        self.model: str = model
+        # "type" writes at the cursor, "clipboard" copies the text
+        self.output: str = output
+        # "push_to_talk" records while the chord is held, "hands_free" starts on a tap
+        # and stops by itself at the end of speech
+        self.mode: str = mode
+
+
 def get_secret_file_path() -> str:
     """Get the path to the .secret file next to the executable or in the project root."""
     if getattr(sys, 'frozen', False):
@@ -29,6 +53,40 @@ def get_config_file_path() -> str:
         return os.path.join(os.path.dirname(os.path.dirname(__file__)), ".config.json")
 
 
+def get_vocabulary_file_path() -> str:
+    """Get the path to the vocabulary.json file next to the executable or in the project root."""
+    if getattr(sys, 'frozen', False):
+        # Running as a bundled exe - save next to the executable
+        return os.path.join(os.path.dirname(sys.executable), "vocabulary.json")
+    else:
+        # Running as a script - save in project root
+        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "vocabulary.json")
+
+
+def get_profiler_output_dir() -> str:
+    """Get the directory where profiler output is written, next to the executable or in the project root."""
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), "profiler")
+    else:
+        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "profiler")
+
+
+def get_spool_dir() -> str:
+    """Get the directory holding recordings waiting to be transcribed."""
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), "spool")
+    else:
+        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "spool")
+
+
+def get_archive_dir() -> str:
+    """Get the directory holding the archive of transcribed clips."""
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), "archive")
+    else:
+        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "archive")
+
+
 def load_api_key() -> str:
     """Load API key from .secret file."""
     secret_file = get_secret_file_path()
@@ -80,6 +138,43 @@ def load_settings() -> dict:
     return default_settings
 
 
+def _resolve_settings_path(path: str) -> str:
+    """Resolve a path from the settings relative to the folder holding .config.json."""
+    if not path or os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(get_config_file_path()), path)
+
+
+def load_profiles(settings_dict: dict) -> list:
+    """Build the dictation profiles, defaulting to one profile on START_RECORDING_SHORTCUT."""
+    profiles = []
+    entries = settings_dict.get("PROFILES") or []
+    if not isinstance(entries, list):
+        print("Ignoring PROFILES: expected a list of profiles")
+        entries = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("shortcut"), str):
+            print(f"Ignoring invalid entry {index + 1} in PROFILES: {entry!r}")
+            continue
+        profiles.append(DictationProfile(
+            name=entry.get("name", f"profile-{index + 1}"),
+            shortcut=entry["shortcut"],
+            language=entry.get("language", ""),
+            prompt=entry.get("prompt", ""),
+            vocabulary=_resolve_settings_path(entry.get("vocabulary", "")),
+            model=entry.get("model", DEFAULT_MODEL),
+            output=entry.get("output", "type"),
+            mode=entry.get("mode", settings_dict.get("RECORDING_MODE", "push_to_talk")),
+        ))
+    if not profiles:
+        profiles.append(DictationProfile(
+            "default",
+            settings_dict.get("START_RECORDING_SHORTCUT", "ctrl+alt+o"),
+            mode=settings_dict.get("RECORDING_MODE", "push_to_talk"),
+        ))
+    return profiles
+
+
 def save_settings(settings_dict: dict) -> None:
     """Save settings to .config.json file."""
     config_file = get_config_file_path()
@@ -97,9 +192,50 @@ START_RECORDING_SHORTCUT = json_settings.get("START_RECORDING_SHORTCUT", "ctrl+a
 STOP_RECORDING_SHORTCUT = json_settings.get("STOP_RECORDING_SHORTCUT", "ctrl+alt+o")
 EXIT_SHORTCUT = json_settings.get("EXIT_SHORTCUT", "ctrl+alt+x")
 
+# Audio stream parameters - AUDIO_BLOCKSIZE is a frame count, 0 for the host default,
+# or "auto" to pick the smallest blocksize that runs without overflows
+AUDIO_BLOCKSIZE = json_settings.get("AUDIO_BLOCKSIZE", 0)
+AUDIO_TUNED_BLOCKSIZE = json_settings.get("AUDIO_TUNED_BLOCKSIZE", 0)
+AUDIO_LATENCY = json_settings.get("AUDIO_LATENCY", "high")
+AUDIO_DTYPE = json_settings.get("AUDIO_DTYPE", "float32")
+AUDIO_DEVICE = json_settings.get("AUDIO_DEVICE", None)
+# "stream" captures in-process, "process" in a helper process through shared memory
+AUDIO_BACKEND = json_settings.get("AUDIO_BACKEND", "stream")
+# How often to look for plugged/unplugged microphones, 0 to disable
+DEVICE_RESCAN_SECONDS = json_settings.get("DEVICE_RESCAN_SECONDS", 300)
+
+# Seconds without dictation before heavy resources are released, 0 to disable
+IDLE_TIMEOUT_SECONDS = json_settings.get("IDLE_TIMEOUT_SECONDS", 300)
+
+PROFILES = load_profiles(json_settings)
+
+# Upper bound for recordings kept on disk after a failed transcription
+SPOOL_MAX_MB = json_settings.get("SPOOL_MAX_MB", 50)
+
+# Silence after speech that ends a hands-free recording
+TRAILING_SILENCE_MS = json_settings.get("TRAILING_SILENCE_MS", 700)
+
+# Keep trimmed recordings and their transcripts for later re-transcription
+ARCHIVE_ENABLED = json_settings.get("ARCHIVE_ENABLED", False)
+
 def reload_settings() -> None:
     global START_RECORDING_SHORTCUT, STOP_RECORDING_SHORTCUT, EXIT_SHORTCUT
+    global AUDIO_BLOCKSIZE, AUDIO_TUNED_BLOCKSIZE, AUDIO_LATENCY, AUDIO_DTYPE, AUDIO_DEVICE
+    global AUDIO_BACKEND, DEVICE_RESCAN_SECONDS, IDLE_TIMEOUT_SECONDS, PROFILES, SPOOL_MAX_MB, TRAILING_SILENCE_MS
+    global ARCHIVE_ENABLED
     json_settings = load_settings()
     START_RECORDING_SHORTCUT = json_settings.get("START_RECORDING_SHORTCUT", "ctrl+alt+o")
     STOP_RECORDING_SHORTCUT = json_settings.get("STOP_RECORDING_SHORTCUT", "ctrl+alt+o")
     EXIT_SHORTCUT = json_settings.get("EXIT_SHORTCUT", "ctrl+alt+x")
+    AUDIO_BLOCKSIZE = json_settings.get("AUDIO_BLOCKSIZE", 0)
+    AUDIO_TUNED_BLOCKSIZE = json_settings.get("AUDIO_TUNED_BLOCKSIZE", 0)
+    AUDIO_LATENCY = json_settings.get("AUDIO_LATENCY", "high")
+    AUDIO_DTYPE = json_settings.get("AUDIO_DTYPE", "float32")
+    AUDIO_DEVICE = json_settings.get("AUDIO_DEVICE", None)
+    AUDIO_BACKEND = json_settings.get("AUDIO_BACKEND", "stream")
+    IDLE_TIMEOUT_SECONDS = json_settings.get("IDLE_TIMEOUT_SECONDS", 300)
+    PROFILES = load_profiles(json_settings)
+    SPOOL_MAX_MB = json_settings.get("SPOOL_MAX_MB", 50)
+    TRAILING_SILENCE_MS = json_settings.get("TRAILING_SILENCE_MS", 700)
+    DEVICE_RESCAN_SECONDS = json_settings.get("DEVICE_RESCAN_SECONDS", 300)
+    ARCHIVE_ENABLED = json_settings.get("ARCHIVE_ENABLED", False)
@@ -0,0 +1,168 @@
+import threading
+from typing import Callable, List, Optional, Tuple, Union
+
+import sounddevice as sd
+
+DeviceSpec = Optional[Union[int, str]]
+
+# Delay before retrying a rescan that was skipped because a stream was open
+BUSY_RETRY_SECONDS: float = 2.0
+
+
+class DeviceManager:
+    """Caches the input device list and follows hot-plug changes in the background.
+
+    PortAudio only enumerates devices when it is initialized, so a rescan means
+    re-initializing it. Rescans run on a background thread when the OS reports a
+    device change, after a stream failed to open, or at a slow fallback interval
+    outside idle mode; pressing the hotkey only ever reads the cached choice.
+    """
+
+    def __init__(
+        self,
+        preferred: DeviceSpec = None,
+        rescan_seconds: float = 300.0,
+        on_change: Optional[Callable[[Optional[int], str], None]] = None,
+        is_busy: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.preferred: DeviceSpec = preferred
+        self.rescan_seconds: float = rescan_seconds
+        self.on_change = on_change
+        # Whether a stream is open in this process; checked with the lock held
+        self.is_busy = is_busy
+        # Every stream must be opened with this lock held: a rescan terminates PortAudio
+        self.lock = threading.Lock()
+        self.devices: List[dict] = []
+        self.current_index: Optional[int] = None
+        self.current_name: str = ""
+        self.default_index: Optional[int] = None
+        self.suspended: bool = False
+        self._signature: Tuple = ()
+        self._refresh_requested: bool = False
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="whisprly-devices", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+
+    def request_refresh(self) -> None:
+        """Rescan soon, e.g. when the OS reports that audio devices changed."""
+        self._refresh_requested = True
+        self._wake_event.set()
+
+    def suspend(self) -> None:
+        """Stop periodic rescans, requested ones still run."""
+        self.suspended = True
+
+    def resume(self) -> None:
+        self.suspended = False
+        # Re-arm the fallback interval without rescanning now
+        self._wake_event.set()
+
+    @property
+    def current_spec(self) -> Optional[str]:
+        """The current device for another PortAudio instance, None for the system default.
+
+        Indices may differ between processes, and a bare name is ambiguous on Windows
+        where MME, DirectSound and WASAPI list the same microphone, so the device is
+        named as "<name>, <host API name>", which sounddevice matches exactly.
+        """
+        if self.current_index is None or self.current_index == self.default_index:
+            return None
+        device = self.devices[self.current_index]
+        return f"{device['name']}, {device['hostapi_name']}"
+
+    def set_preferred(self, preferred: DeviceSpec) -> None:
+        self.preferred = preferred
+        if self.devices:
+            self._select()
+
+    def _run(self) -> None:
+        self.refresh(reinitialize=False)
+        while not self._stop_event.is_set():
+            if self._refresh_requested:
+                timeout: Optional[float] = BUSY_RETRY_SECONDS
+            elif self.suspended or not self.rescan_seconds:
+                timeout = None
+            else:
+                timeout = self.rescan_seconds
+            woken = self._wake_event.wait(timeout)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            if woken and not self._refresh_requested:
+                continue
+            self._refresh_requested = False
+            if self.refresh(skip_if_busy=True) is None:
+                # A stream is open, try again once it is closed
+                self._refresh_requested = True
+
+    def refresh(self, reinitialize: bool = True, skip_if_busy: bool = False) -> Optional[bool]:
+        """Re-enumerate input devices; return True if the list changed, None if skipped."""
+        with self.lock:
+            if skip_if_busy and self.is_busy and self.is_busy():
+                return None
+            if reinitialize:
+                # Private sounddevice helpers, the only way to make PortAudio rescan
+                sd._terminate()
+                sd._initialize()
+            try:
+                devices = [dict(device) for device in sd.query_devices()]  # type: ignore[union-attr]
+                hostapis = sd.query_hostapis()
+                for device in devices:
+                    device["hostapi_name"] = hostapis[device["hostapi"]]["name"]  # type: ignore[index]
+                try:
+                    default_index: Optional[int] = sd.query_devices(kind="input")["index"]  # type: ignore[index]
+                except sd.PortAudioError:
+                    default_index = None
+            except Exception as e:
+                print(f"Could not enumerate audio devices: {e}")
+                return False
+
+        signature = tuple(
+            (device["name"], device["hostapi"], device["max_input_channels"])
+            for device in devices
+        ) + (default_index,)
+        if signature == self._signature:
+            return False
+        first_scan = not self._signature
+        self._signature = signature
+        self.devices = devices
+        self.default_index = default_index
+        if not first_scan:
+            print("Audio devices changed")
+        self._select()
+        return True
+
+    def _select(self) -> None:
+        index = self._resolve(self.preferred)
+        name = self.devices[index]["name"] if index is not None else ""
+        if index == self.current_index and name == self.current_name:
+            return
+        self.current_index = index
+        self.current_name = name
+        print(f"Using input device: {name or 'system default'}")
+        if self.on_change:
+            self.on_change(index, name)
+
+    def _resolve(self, preferred: DeviceSpec) -> Optional[int]:
+        inputs = [
+            index for index, device in enumerate(self.devices)
+            if device["max_input_channels"] > 0
+        ]
+        if isinstance(preferred, int) and preferred in inputs:
+            return preferred
+        if isinstance(preferred, str) and preferred:
+            for index in inputs:
+                if preferred.lower() in self.devices[index]["name"].lower():
+                    return index
+        # Fall back to the system default input
+        if self.default_index in inputs:
+            return self.default_index
+        return inputs[0] if inputs else None
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from groq import APIStatusError, Groq
+
+from .client import create_client
+
+DEFAULT_MODEL: str = "whisper-large-v3-turbo"
+TRANSCRIPTION_PATHS = (
+    "/audio/transcriptions",
+    "/v1/audio/transcriptions",
+    "/openai/v1/audio/transcriptions",
+)
+# Form fields forwarded upstream besides file and model
+FORWARDED_FIELDS = ("language", "prompt", "response_format", "temperature")
+
+Response = Tuple[int, str, bytes]
+
+
+class RateLimiter:
+    """Token bucket shared by every client of the gateway."""
+
+    def __init__(self, requests_per_minute: float) -> None:
+        self.rate: float = requests_per_minute / 60.0
+        self.capacity: float = max(1.0, requests_per_minute / 60.0)
+        self.tokens: float = self.capacity
+        self.updated: float = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranscriptionGateway:
+    """Forward transcription requests from many local clients over one upstream pool.
+
+    Identical requests in flight at the same time are merged into a single upstream
+    call, and every call goes through the same concurrency limit and rate limiter.
+    """
+
+    def __init__(self, client: Groq, max_concurrency: int, requests_per_minute: float) -> None:
+        self.client: Groq = client
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.inflight: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.upstream_calls: int = 0
+        self.merged_calls: int = 0
+
+    def transcribe(self, filename: str, audio: bytes, params: Dict[str, str]) -> Response:
+        digest = hashlib.sha256(audio)
+        digest.update(json.dumps(params, sort_keys=True).encode())
+        key = digest.hexdigest()
+
+        with self.lock:
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.inflight[key] = future
+            else:
+                self.merged_calls += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            response = self._call_upstream(filename, audio, params)
+            future.set_result(response)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[key]
+        return response
+
+    def _call_upstream(self, filename: str, audio: bytes, params: Dict[str, str]) -> Response:
+        kwargs: Dict[str, object] = {
+            name: params[name] for name in FORWARDED_FIELDS if name in params
+        }
+        if "temperature" in kwargs:
+            kwargs["temperature"] = float(kwargs["temperature"])  # type: ignore[arg-type]
+
+        with self.slots:
+            self.rate_limiter.acquire()
+            self.upstream_calls += 1
+            try:
+                raw = self.client.audio.transcriptions.with_raw_response.create(
+                    file=(filename, audio),
+                    model=params.get("model", DEFAULT_MODEL),
+                    **kwargs,  # type: ignore[arg-type]
+                )
+            except APIStatusError as e:
+                return (
+                    e.status_code,
+                    e.response.headers.get("content-type", "application/json"),
+                    e.response.content,
+                )
+        http_response = raw.http_response
+        return (
+            http_response.status_code,
+            http_response.headers.get("content-type", "application/json"),
+            http_response.content,
+        )
+
+
+def parse_multipart(content_type: str, body: bytes) -> Dict[str, Tuple[Optional[str], bytes]]:
+    """Split a multipart/form-data body into {name: (filename, content)}."""
+    header = Message()
+    header["content-type"] = content_type
+    boundary = header.get_param("boundary")
+    if not isinstance(boundary, str):
+        raise ValueError("Missing multipart boundary")
+
+    fields: Dict[str, Tuple[Optional[str], bytes]] = {}
+    delimiter = b"\r\n--" + boundary.encode()
+    for part in (b"\r\n" + body).split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            break
+        headers, _, content = part[2:].partition(b"\r\n\r\n")
+        disposition = Message()
+        for line in headers.decode("utf-8", "replace").split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.strip():
+                disposition[name.strip()] = value.strip()
+        field = disposition.get_param("name", header="content-disposition")
+        if isinstance(field, str):
+            fields[field] = (disposition.get_filename(), content)
+    return fields
+
+
+class GatewayRequestHandler(BaseHTTPRequestHandler):
+    gateway: TranscriptionGateway
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        if self.path.split("?")[0].rstrip("/") not in TRANSCRIPTION_PATHS:
+            # The body is left unread, so this connection cannot carry another request
+            self.close_connection = True
+            self._send(404, "application/json", b'{"error": {"message": "Not found"}}')
+            return
+
+        try:
+            length = int(self.headers.get("content-length", "0"))
+            body = self.rfile.read(length)
+            fields = parse_multipart(self.headers.get("content-type", ""), body)
+            filename, audio = fields.pop("file")
+            params = {name: value.decode() for name, (_, value) in fields.items()}
+        except (KeyError, ValueError) as e:
+            message = json.dumps({"error": {"message": f"Invalid request: {e}"}})
+            self._send(400, "application/json", message.encode())
+            return
+
+        try:
+            status, content_type, payload = self.gateway.transcribe(
+                filename or "audio.wav", audio, params
+            )
+        except Exception as e:
+            message = json.dumps({"error": {"message": f"Upstream error: {e}"}})
+            self._send(502, "application/json", message.encode())
+            return
+        self._send(status, content_type, payload)
+
+    def _send(self, status: int, content_type: str, payload: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        print(f"[gateway] {self.address_string()} {format % args}")
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    max_concurrency: int = 4,
+    requests_per_minute: float = 20,
+) -> None:
+    """Run the local transcription gateway until interrupted."""
+    client = create_client(max_connections=max_concurrency)
+    if client is None:
+        print("No API key configured. Run Whisprly once to set it up.")
+        return
+
+    gateway = TranscriptionGateway(client, max_concurrency, requests_per_minute)
+    handler = type(
+        "BoundGatewayRequestHandler", (GatewayRequestHandler,), {"gateway": gateway}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Whisprly gateway listening on http://{host}:{port}/v1/audio/transcriptions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        client.close()
+        print(
+            f"Gateway stopped: {gateway.upstream_calls} upstream calls, "
+            f"{gateway.merged_calls} merged requests"
+        )
@@ -0,0 +1,244 @@
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .metrics import Histogram
+
+FALLBACK_CHORD: str = "f1"
+FALLBACK_EXIT_SHORTCUT: str = "ctrl+alt+x"
+MODIFIERS = ("ctrl", "alt", "shift")
+
+Chord = Tuple[List[str], str]
+
+
+def parse_chord(shortcut: str) -> Chord:
+    """Split a shortcut such as 'ctrl+alt+o' into its modifiers and main key."""
+    modifiers: List[str] = []
+    key_name = ""
+    for part in shortcut.lower().split("+"):
+        part = part.strip()
+        if part in ["ctrl", "control"]:
+            modifiers.append("ctrl")
+        elif part in ["alt"]:
+            modifiers.append("alt")
+        elif part in ["shift"]:
+            modifiers.append("shift")
+        else:
+            key_name = part
+    return modifiers, key_name
+
+
+def _run_hotkey_listener(
+    conn: Connection, chords: Dict[str, str], exit_shortcut: str
+) -> None:
+    """Entry point of the hotkey process: match chords and report them over conn.
+
+    Only this small process hooks the keyboard, so the time every keystroke spends
+    in Python does not depend on the GIL load of the main app.
+    """
+    import keyboard
+
+    send_lock = threading.Lock()
+    # Time every keystroke spends on the library's blocking path: suppressing hooks,
+    # hotkey matching and queueing, all while the OS waits for the hook to return
+    hook_duration = Histogram()
+    pressed: set = set()
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            conn.send(message)
+
+    def send_exit() -> None:
+        # The app shuts down right after, report the latency numbers first
+        send(("stats", hook_duration.summary()))
+        send(("exit",))
+
+    listener = getattr(keyboard, "_listener", None)
+    direct_callback = getattr(listener, "direct_callback", None)
+    if direct_callback is not None:
+        def timed_direct_callback(event) -> bool:
+            started = time.perf_counter()
+            try:
+                return direct_callback(event)
+            finally:
+                hook_duration.record((time.perf_counter() - started) * 1e6)
+
+        # Private API: the OS hook calls this method for every key event; the listener
+        # looks it up when it starts, i.e. on the first hook below
+        listener.direct_callback = timed_direct_callback
+
+    def hook(parsed: Dict[str, Chord]) -> None:
+        # Chords are matched off the keystroke path, on the library's queue thread
+        def on_keyboard_event(event) -> None:
+            name = (event.name or "").lower()
+            held = None
+            for chord_name, (modifiers, key_name) in parsed.items():
+                if name != key_name:
+                    continue
+                if event.event_type == keyboard.KEY_DOWN:
+                    if held is None:
+                        held = {modifier for modifier in MODIFIERS if keyboard.is_pressed(modifier)}
+                    # Exact match, so ctrl+alt+o does not also fire for ctrl+alt+shift+o
+                    if chord_name not in pressed and set(modifiers) == held:
+                        pressed.add(chord_name)
+                        send(("press", chord_name))
+                elif event.event_type == keyboard.KEY_UP:
+                    if chord_name in pressed:
+                        pressed.discard(chord_name)
+                        send(("release", chord_name))
+
+        keyboard.hook(on_keyboard_event, suppress=False)
+
+    try:
+        hook({name: parse_chord(shortcut) for name, shortcut in chords.items()})
+        keyboard.add_hotkey(exit_shortcut, send_exit, suppress=True)
+        send(("ready", f"Record={', '.join(chords.values())}, Exit={exit_shortcut}"))
+    except Exception as e:
+        send(("error", f"Error registering hotkeys: {e}"))
+        keyboard.unhook_all()
+        try:
+            # Fall back to a single F1 chord for the first profile
+            first = next(iter(chords), "default")
+            hook({first: parse_chord(FALLBACK_CHORD)})
+            keyboard.add_hotkey(FALLBACK_EXIT_SHORTCUT, send_exit, suppress=True)
+            send(("ready", f"Record={FALLBACK_CHORD}, Exit={FALLBACK_EXIT_SHORTCUT}"))
+        except Exception as e:
+            send(("error", f"Even fallback hotkeys failed: {e}"))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message[0] == "stats":
+            send(("stats", hook_duration.summary()))
+        elif message[0] == "stop":
+            break
+
+    keyboard.unhook_all()
+
+
+class HotkeyProcess:
+    """Runs the global keyboard hook in a separate process and dispatches its events.
+
+    A reader thread blocks on the pipe and hands presses and releases, in order, to a
+    dispatch thread; a callback that uploads a recording never stops the reader from
+    answering stats requests or handling the exit chord. No polling is involved.
+    """
+
+    def __init__(
+        self,
+        on_press: Callable[[str], None],
+        on_release: Callable[[str], None],
+        on_exit: Callable[[], None],
+    ) -> None:
+        self.on_press = on_press
+        self.on_release = on_release
+        self.on_exit = on_exit
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Optional[Connection] = None
+        self.reader: Optional[threading.Thread] = None
+        self.dispatcher: Optional[threading.Thread] = None
+        self._events: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._stats_reply: Optional[str] = None
+        self._stats_event = threading.Event()
+
+    def start(self, chords: Dict[str, str], exit_shortcut: str) -> None:
+        self.stop()
+        # spawn keeps the child free of Qt/PortAudio state on every platform
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_run_hotkey_listener,
+            args=(child_conn, chords, exit_shortcut),
+            name="whisprly-hotkeys",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self._events = queue.Queue()
+        self.reader = threading.Thread(
+            target=self._read, args=(parent_conn, self._events), name="whisprly-hotkey-reader",
+            daemon=True,
+        )
+        self.reader.start()
+        self.dispatcher = threading.Thread(
+            target=self._dispatch, args=(self._events,), name="whisprly-hotkey-dispatch",
+            daemon=True,
+        )
+        self.dispatcher.start()
+
+    def _dispatch(self, events: "queue.Queue[Optional[Tuple[str, str]]]") -> None:
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            kind, chord_name = event
+            try:
+                if kind == "press":
+                    self.on_press(chord_name)
+                else:
+                    self.on_release(chord_name)
+            except Exception as e:
+                print(f"Error handling hotkey {kind}: {e}")
+
+    def _read(self, conn: Connection, events: "queue.Queue[Optional[Tuple[str, str]]]") -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind in ("press", "release"):
+                events.put((kind, message[1]))
+            elif kind == "exit":
+                self.on_exit()
+            elif kind == "stats":
+                self._stats_reply = message[1]
+                self._stats_event.set()
+            elif kind == "ready":
+                print(f"Hotkeys registered: {message[1]}")
+            elif kind == "error":
+                print(message[1])
+
+    def latency_summary(self, timeout: float = 2.0) -> str:
+        """Per-keystroke time spent on the blocking keyboard hook path of the hotkey process."""
+        if not self.conn:
+            return "hotkey process not running"
+        if self.reader is threading.current_thread():
+            # Replies are read by this very thread, use the last reported numbers
+            return self._stats_reply or "unavailable"
+        self._stats_event.clear()
+        try:
+            self.conn.send(("stats",))
+        except (OSError, ValueError):
+            return "hotkey process not running"
+        if not self._stats_event.wait(timeout):
+            return "no reply from hotkey process"
+        return self._stats_reply or ""
+
+    def stop(self) -> None:
+        if self.conn:
+            try:
+                self.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        if self.process:
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+        if self.reader and self.reader is not threading.current_thread():
+            self.reader.join(timeout=2)
+        self.reader = None
+        if self.dispatcher:
+            # Not joined: it may be busy with a transcription, it exits once that is done
+            self._events.put(None)
+            self.dispatcher = None
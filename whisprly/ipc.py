@@ -0,0 +1,62 @@
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+SERVER_NAME: str = "whisprly-control"
+
+
+class ControlServer(QObject):
+    """Local socket (named pipe on Windows) accepting one-line text commands."""
+
+    def __init__(self, handler: Callable[[str], str], parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.handler = handler
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        # Remove a stale socket left behind by a crashed instance
+        QLocalServer.removeServer(SERVER_NAME)
+        if not self.server.listen(SERVER_NAME):
+            print(f"Could not start control server: {self.server.errorString()}")
+            return False
+        return True
+
+    def close(self) -> None:
+        self.server.close()
+
+    def _on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            if connection is None:
+                break
+            connection.readyRead.connect(lambda c=connection: self._on_ready_read(c))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def _on_ready_read(self, connection: QLocalSocket) -> None:
+        while connection.canReadLine():
+            command = bytes(connection.readLine().data()).decode().strip()
+            try:
+                reply = self.handler(command)
+            except Exception as e:
+                reply = f"error: {e}"
+            connection.write((reply + "\n").encode())
+            connection.flush()
+
+
+def send_command(command: str, timeout_ms: int = 3000) -> str:
+    """Send a command to the running instance and return its reply."""
+    socket = QLocalSocket()
+    socket.connectToServer(SERVER_NAME)
+    if not socket.waitForConnected(timeout_ms):
+        raise ConnectionError("Whisprly does not seem to be running")
+    socket.write((command + "\n").encode())
+    socket.flush()
+    reply = b""
+    while not reply.endswith(b"\n"):
+        if not socket.waitForReadyRead(timeout_ms):
+            raise TimeoutError(f"No reply to '{command}'")
+        reply += bytes(socket.readAll().data())
+    socket.disconnectFromServer()
+    return reply.decode().strip()
@@ -0,0 +1,182 @@
+import argparse
+import multiprocessing
+import sys
+from typing import List, Optional
+
+
+def _run_app() -> None:
+    from .app import VoiceToTextApp
+
+    app = VoiceToTextApp()
+    app.run()
+
+
+def _profile(args: argparse.Namespace) -> int:
+    from .ipc import send_command
+
+    command = f"profile {args.action}"
+    if args.action == "start" and args.duration:
+        command += f" {args.duration}"
+    try:
+        print(send_command(command))
+    except (ConnectionError, TimeoutError) as e:
+        print(e)
+        return 1
+    return 0
+
+
+def _stats(args: argparse.Namespace) -> int:
+    from .ipc import send_command
+
+    try:
+        print(send_command(f"{args.command} {args.action}"))
+    except (ConnectionError, TimeoutError) as e:
+        print(e)
+        return 1
+    return 0
+
+
+def _vad_eval(args: argparse.Namespace) -> int:
+    from .vad import evaluate_endpointer
+
+    print(evaluate_endpointer(args.fixtures, trailing_silence_ms=args.trailing_silence_ms))
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from .gateway import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        max_concurrency=args.max_concurrency,
+        requests_per_minute=args.requests_per_minute,
+    )
+    return 0
+
+
+def _timestamp(value: str) -> float:
+    from datetime import datetime
+
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _retranscribe(args: argparse.Namespace) -> int:
+    from .archive import ClipArchive, retranscribe
+    from .client import create_client
+    from .config import get_archive_dir
+    from .vocabulary import Vocabulary
+
+    client = create_client(max_connections=args.concurrency)
+    if client is None:
+        print("No API key configured. Run Whisprly once to set it up.")
+        return 1
+    fields = {"model": args.model}
+    if args.language:
+        fields["language"] = args.language
+    if args.prompt:
+        fields["prompt"] = args.prompt
+    postprocess = Vocabulary(args.vocabulary).apply if args.vocabulary else str.strip
+    print(retranscribe(
+        ClipArchive(get_archive_dir()),
+        client,
+        fields,
+        since=args.since,
+        until=args.until,
+        concurrency=args.concurrency,
+        postprocess=postprocess,
+    ))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # Needed for the helper processes when running as a PyInstaller executable
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(prog="whisprly")
+    subparsers = parser.add_subparsers(dest="command")
+
+    profile_parser = subparsers.add_parser(
+        "profile", help="Profile the running instance"
+    )
+    profile_parser.add_argument("action", choices=["start", "stop", "status"])
+    profile_parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop automatically after this many seconds",
+    )
+
+    hotkeys_parser = subparsers.add_parser(
+        "hotkeys", help="Inspect the hotkey process of the running instance"
+    )
+    hotkeys_parser.add_argument("action", choices=["stats"])
+
+    audio_parser = subparsers.add_parser(
+        "audio", help="Show input stream health of the last recording of the running instance"
+    )
+    audio_parser.add_argument("action", choices=["stats"])
+
+    dictation_parser = subparsers.add_parser(
+        "dictation", help="Show per-dictation-profile latency of the running instance"
+    )
+    dictation_parser.add_argument("action", choices=["stats"])
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a local OpenAI/Groq-compatible transcription endpoint"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum simultaneous upstream requests",
+    )
+    serve_parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=20,
+        help="Upstream rate limit shared by all clients, 0 to disable",
+    )
+
+    vad_parser = subparsers.add_parser(
+        "vad-eval", help="Measure hands-free endpointing on recorded fixtures"
+    )
+    vad_parser.add_argument(
+        "fixtures", help="Folder of WAV files with {\"speech_end\": seconds} JSON sidecars"
+    )
+    vad_parser.add_argument("--trailing-silence-ms", type=int, default=700)
+
+    retranscribe_parser = subparsers.add_parser(
+        "retranscribe", help="Transcribe archived clips again and compare with the originals"
+    )
+    retranscribe_parser.add_argument(
+        "--since", type=_timestamp, default=0.0, help="ISO date or time, e.g. 2024-05-01"
+    )
+    retranscribe_parser.add_argument(
+        "--until", type=_timestamp, default=None, help="ISO date or time, exclusive"
+    )
+    retranscribe_parser.add_argument("--model", default="whisper-large-v3")
+    retranscribe_parser.add_argument("--language", default="")
+    retranscribe_parser.add_argument("--prompt", default="")
+    retranscribe_parser.add_argument(
+        "--vocabulary", default="", help="Vocabulary file applied to the new transcripts"
+    )
+    retranscribe_parser.add_argument(
+        "--concurrency", type=int, default=4, help="Maximum simultaneous requests"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "profile":
+        sys.exit(_profile(args))
+    if args.command in ("audio", "hotkeys", "dictation"):
+        sys.exit(_stats(args))
+    if args.command == "vad-eval":
+        sys.exit(_vad_eval(args))
+    if args.command == "serve":
+        sys.exit(_serve(args))
+    if args.command == "retranscribe":
+        sys.exit(_retranscribe(args))
+    _run_app()
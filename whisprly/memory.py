@@ -0,0 +1,43 @@
+import ctypes
+import ctypes.util
+import sys
+
+import psutil
+
+
+def get_rss_mb() -> float:
+    """Return the resident set size of the current process in MiB."""
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def get_children_rss_mb() -> float:
+    """Return the combined resident set size of the helper processes in MiB.
+
+    Shared memory, such as the capture ring, counts in every process that touched it.
+    """
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            # Exited since it was listed
+            continue
+    return total / (1024 * 1024)
+
+
+def trim_process_memory() -> None:
+    """Ask the allocator / OS to give freed memory back."""
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+            handle = kernel32.GetCurrentProcess()
+            # (-1, -1) empties the working set; pages come back on demand
+            kernel32.SetProcessWorkingSetSize(
+                handle, ctypes.c_size_t(-1), ctypes.c_size_t(-1)
+            )
+        elif sys.platform.startswith("linux"):
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            if hasattr(libc, "malloc_trim"):
+                libc.malloc_trim(0)
+    except Exception as e:
+        print(f"Could not trim process memory: {e}")
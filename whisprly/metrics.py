@@ -0,0 +1,90 @@
+import time
+from typing import List, Tuple
+
+import psutil
+
+# Bucket upper bounds in microseconds, roughly logarithmic
+DEFAULT_BOUNDS_US: Tuple[float, ...] = (
+    50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000,
+    250_000, 500_000, 1_000_000, 2_500_000, 5_000_000,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram cheap enough to update from an audio callback."""
+
+    def __init__(self, bounds_us: Tuple[float, ...] = DEFAULT_BOUNDS_US) -> None:
+        self.bounds_us: Tuple[float, ...] = bounds_us
+        self.reset()
+
+    def reset(self) -> None:
+        self.buckets: List[int] = [0] * (len(self.bounds_us) + 1)
+        self.count: int = 0
+        self.total_us: float = 0.0
+        self.max_us: float = 0.0
+
+    def record(self, value_us: float) -> None:
+        index = 0
+        bounds = self.bounds_us
+        while index < len(bounds) and value_us > bounds[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given percentile (0 < fraction <= 1)."""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= threshold:
+                if index < len(self.bounds_us):
+                    return min(self.bounds_us[index], self.max_us)
+                return self.max_us
+        return self.max_us
+
+    def summary(self) -> str:
+        if not self.count:
+            return "n=0"
+        mean = self.total_us / self.count
+        return (
+            f"n={self.count} mean={_format_us(mean)} p50<={_format_us(self.percentile(0.5))} "
+            f"p99<={_format_us(self.percentile(0.99))} max={_format_us(self.max_us)}"
+        )
+
+
+def _format_us(value_us: float) -> str:
+    if value_us >= 1_000_000:
+        return f"{value_us / 1_000_000:.2f}s"
+    if value_us >= 1_000:
+        return f"{value_us / 1_000:.1f}ms"
+    return f"{value_us:.0f}us"
+
+
+class WakeupMeter:
+    """Measure how often the process is scheduled, via its context switch counters."""
+
+    def __init__(self) -> None:
+        self.process = psutil.Process()
+        self._start_switches: int = 0
+        self._start_time: float = 0.0
+
+    def _switches(self) -> int:
+        switches = self.process.num_ctx_switches()
+        return switches.voluntary + switches.involuntary
+
+    def start(self) -> None:
+        self._start_switches = self._switches()
+        self._start_time = time.monotonic()
+
+    def rate(self) -> float:
+        """Context switches per second since start()."""
+        elapsed = time.monotonic() - self._start_time
+        if elapsed <= 0:
+            return 0.0
+        return (self._switches() - self._start_switches) / elapsed
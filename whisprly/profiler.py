@@ -0,0 +1,138 @@
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+FunctionKey = Tuple[str, int, str]
+
+DEFAULT_INTERVAL: float = 0.005
+
+
+class SamplingProfiler:
+    """Low-overhead statistical profiler covering every Python thread.
+
+    A background thread samples the stacks of all threads with sys._current_frames(),
+    so threads that were started before profiling (keyboard hook, PortAudio callback,
+    Qt main thread) are included without being instrumented.
+    """
+
+    def __init__(self, output_dir: str, interval: float = DEFAULT_INTERVAL) -> None:
+        self.output_dir: str = output_dir
+        self.interval: float = interval
+        self.thread: Optional[threading.Thread] = None
+        self.on_finished: Optional[Callable[[Tuple[str, str]], None]] = None
+        self._stop_event = threading.Event()
+        self._stacks: Counter = Counter()
+        self._samples: int = 0
+        self._started_at: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration: Optional[float] = None) -> None:
+        """Start sampling; stop automatically after duration seconds if given."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._stacks = Counter()
+        self._samples = 0
+        self._started_at = time.monotonic()
+        self.thread = threading.Thread(
+            target=self._run, args=(duration,), name="whisprly-profiler", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _run(self, duration: Optional[float]) -> None:
+        deadline = self._started_at + duration if duration else None
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self._sample(own_ident)
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        paths = self._write()
+        if self.on_finished:
+            self.on_finished(paths)
+
+    def _sample(self, own_ident: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack: List[FunctionKey] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            stack.reverse()
+            self._stacks[(names.get(ident, f"thread-{ident}"), tuple(stack))] += 1
+        self._samples += 1
+
+    def _write(self) -> Tuple[str, str]:
+        elapsed = time.monotonic() - self._started_at
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir, time.strftime("whisprly-%Y%m%d-%H%M%S")
+        )
+        pstats_path = base + ".pstats"
+        collapsed_path = base + ".collapsed"
+
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for (thread_name, stack), count in self._stacks.items():
+                frames = [thread_name.replace(";", "_")] + [
+                    f"{name} ({os.path.basename(filename)}:{line})".replace(";", "_")
+                    for filename, line, name in stack
+                ]
+                f.write(f"{';'.join(frames)} {count}\n")
+
+        with open(pstats_path, "wb") as f:
+            # Sampling runs slower than the nominal interval, weigh samples by the
+            # measured period so that times add up to the wall-clock duration
+            period = elapsed / self._samples if self._samples else self.interval
+            marshal.dump(self._build_pstats(period), f)
+
+        print(
+            f"Profile written ({self._samples} samples over {elapsed:.1f}s): "
+            f"{pstats_path}, {collapsed_path}"
+        )
+        return pstats_path, collapsed_path
+
+    def _build_pstats(self, period: float) -> Dict[FunctionKey, tuple]:
+        """Convert samples taken every period seconds into the pstats.Stats dict format."""
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        edges: Dict[FunctionKey, Counter] = {}
+
+        for (_, stack), count in self._stacks.items():
+            if not stack:
+                continue
+            own[stack[-1]] += count
+            for function in set(stack):
+                inclusive[function] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                edges.setdefault(callee, Counter())[caller] += count
+
+        interval = period
+        stats: Dict[FunctionKey, tuple] = {}
+        for function, samples in inclusive.items():
+            callers = {
+                caller: (n, n, 0.0, n * interval)
+                for caller, n in edges.get(function, {}).items()
+            }
+            # Call counts are unknown when sampling; sample counts stand in for them
+            stats[function] = (
+                samples,
+                samples,
+                own[function] * interval,
+                samples * interval,
+                callers,
+            )
+        return stats
@@ -0,0 +1,266 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import groq
+import httpx
+import soundfile as sf
+
+AUDIO_SUFFIX: str = ".flac"
+META_SUFFIX: str = ".json"
+
+INITIAL_BACKOFF: float = 5.0
+MAX_BACKOFF: float = 300.0
+# Outcomes of a flushed batch
+FLUSHED: str = "flushed"
+RETRY: str = "retry"
+PAUSE: str = "pause"
+BATCH_SIZE: int = 4
+# A clip still failing with transient errors after this many retries is dropped
+MAX_ATTEMPTS: int = 20
+# Definitive rejections of the audio itself, retrying would fail the same way
+REJECTED_AUDIO_STATUSES = (400, 413, 415, 422)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    return status
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a failed transcription may succeed later (network, rate limit, outage).
+
+    Other failures, such as an invalid key or audio the API rejects, would fail
+    the same way on every retry.
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    return isinstance(
+        error, (httpx.TransportError, groq.APIConnectionError, TimeoutError, ConnectionError)
+    )
+
+
+def is_rejected_audio(error: Exception) -> bool:
+    """Whether the API refused the audio itself, the only reason to drop a spooled clip."""
+    return _status_code(error) in REJECTED_AUDIO_STATUSES
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data so that path either holds the old content or all of the new one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SpoolEntry:
+    def __init__(self, clip_id: str, audio_path: str, metadata: dict) -> None:
+        self.clip_id: str = clip_id
+        self.audio_path: str = audio_path
+        self.metadata: dict = metadata
+
+    @property
+    def created(self) -> float:
+        return float(self.metadata.get("created", 0))
+
+
+class Spool:
+    """Bounded on-disk queue of clips that could not be transcribed yet.
+
+    Audio is stored as FLAC, then a JSON sidecar is written; the sidecar acts as the
+    commit marker, so a crash mid-write never leaves a half-spooled clip behind.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._remove_incomplete()
+
+    def _remove_incomplete(self) -> None:
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            clip_id, suffix = os.path.splitext(filename)
+            orphan = suffix == AUDIO_SUFFIX and not os.path.exists(
+                os.path.join(self.directory, clip_id + META_SUFFIX)
+            )
+            if filename.endswith(".tmp") or orphan:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def add(self, wav_path: str, metadata: dict) -> str:
+        """Store a copy of wav_path and return its clip id."""
+        clip_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        audio_path = os.path.join(self.directory, clip_id + AUDIO_SUFFIX)
+        data, rate = sf.read(wav_path, dtype="int16")
+
+        with self.lock:
+            tmp_path = f"{audio_path}.tmp"
+            sf.write(tmp_path, data, rate, format="FLAC")
+            with open(tmp_path, "rb+") as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, audio_path)
+
+            metadata = dict(metadata, created=time.time())
+            _atomic_write(
+                os.path.join(self.directory, clip_id + META_SUFFIX),
+                json.dumps(metadata).encode(),
+            )
+            self._enforce_limit()
+        return clip_id
+
+    def pending(self) -> List[SpoolEntry]:
+        """Spooled clips, oldest first."""
+        entries: List[SpoolEntry] = []
+        for filename in os.listdir(self.directory):
+            clip_id, suffix = os.path.splitext(filename)
+            if suffix != META_SUFFIX:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), "r") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                continue
+            audio_path = os.path.join(self.directory, clip_id + AUDIO_SUFFIX)
+            if os.path.exists(audio_path):
+                entries.append(SpoolEntry(clip_id, audio_path, metadata))
+        entries.sort(key=lambda entry: entry.created)
+        return entries
+
+    def record_failure(self, entry: SpoolEntry) -> int:
+        """Count a failed retry in the entry's sidecar and return the attempts so far."""
+        entry.metadata["attempts"] = int(entry.metadata.get("attempts", 0)) + 1
+        _atomic_write(
+            os.path.join(self.directory, entry.clip_id + META_SUFFIX),
+            json.dumps(entry.metadata).encode(),
+        )
+        return entry.metadata["attempts"]
+
+    def remove(self, clip_id: str) -> None:
+        # Drop the commit marker first so a crash never leaves a marker without audio
+        for suffix in (META_SUFFIX, AUDIO_SUFFIX):
+            try:
+                os.remove(os.path.join(self.directory, clip_id + suffix))
+            except FileNotFoundError:
+                pass
+
+    def _enforce_limit(self) -> None:
+        entries = self.pending()
+        sizes = {entry.clip_id: os.path.getsize(entry.audio_path) for entry in entries}
+        total = sum(sizes.values())
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            print(f"Spool full, dropping oldest clip {entry.clip_id}")
+            self.remove(entry.clip_id)
+            total -= sizes[entry.clip_id]
+
+
+class SpoolFlusher:
+    """Background thread draining the spool with exponential backoff.
+
+    The thread sleeps on an event: it only wakes up when a clip is added, when
+    connectivity is known to be back, or when a retry is due. Failures that retrying
+    cannot fix on its own (no API key, rejected key, local errors) pause the retries
+    until the next wake(), e.g. after the settings are saved.
+    """
+
+    def __init__(
+        self,
+        spool: Spool,
+        transcribe: Callable[[SpoolEntry], str],
+        deliver: Callable[[List[Tuple[SpoolEntry, str]]], None],
+    ) -> None:
+        self.spool = spool
+        self.transcribe = transcribe
+        # Called once per batch with every recovered clip, oldest first
+        self.deliver = deliver
+        # True while a batch is in flight, the API clients must stay open meanwhile
+        self.busy: bool = False
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.backoff: float = INITIAL_BACKOFF
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="whisprly-spool", daemon=True)
+        self.thread.start()
+
+    def wake(self, reset_backoff: bool = False) -> None:
+        if reset_backoff:
+            self.backoff = INITIAL_BACKOFF
+        self.wake_event.set()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(max_workers=BATCH_SIZE) as executor:
+            while not self.stop_event.is_set():
+                entries = self.spool.pending()
+                outcome = FLUSHED
+                if entries:
+                    self.busy = True
+                    try:
+                        outcome = self._flush(executor, entries[:BATCH_SIZE])
+                    finally:
+                        self.busy = False
+                    if outcome == FLUSHED:
+                        continue
+                # Nothing to do or paused: block until woken; else wait for the retry
+                self.wake_event.wait(self.backoff if outcome == RETRY else None)
+                self.wake_event.clear()
+
+    def _flush(self, executor: ThreadPoolExecutor, batch: List[SpoolEntry]) -> str:
+        """Transcribe a batch concurrently; return FLUSHED, RETRY or PAUSE."""
+        futures: Dict[str, object] = {
+            entry.clip_id: executor.submit(self.transcribe, entry) for entry in batch
+        }
+        outcome = FLUSHED
+        recovered: List[Tuple[SpoolEntry, str]] = []
+        for entry in batch:
+            try:
+                text = futures[entry.clip_id].result()  # type: ignore[attr-defined]
+            except Exception as e:
+                if is_rejected_audio(e):
+                    print(f"Dropping spooled clip {entry.clip_id}, the API rejected it: {e}")
+                    self.spool.remove(entry.clip_id)
+                elif not is_transient_error(e):
+                    # Missing or rejected key, closed client...: keep the clip for later
+                    print(f"Spooled clip {entry.clip_id} cannot be sent for now: {e}")
+                    outcome = PAUSE
+                elif self.spool.record_failure(entry) >= MAX_ATTEMPTS:
+                    print(f"Dropping spooled clip {entry.clip_id} after {MAX_ATTEMPTS} attempts: {e}")
+                    self.spool.remove(entry.clip_id)
+                else:
+                    print(f"Spooled clip {entry.clip_id} still failing: {e}")
+                    if outcome == FLUSHED:
+                        outcome = RETRY
+                continue
+            self.spool.remove(entry.clip_id)
+            recovered.append((entry, text))
+
+        if recovered:
+            self.deliver(recovered)
+
+        if outcome == FLUSHED:
+            self.backoff = INITIAL_BACKOFF
+        elif outcome == RETRY:
+            self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+            print(f"Retrying spooled clips in {self.backoff:.0f}s")
+        else:
+            print("Spooled clips paused until the settings change or a dictation succeeds")
+        return outcome
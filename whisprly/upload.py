@@ -0,0 +1,151 @@
+import struct
+import time
+import uuid
+from typing import Dict, Iterator, List, Sequence
+
+import httpx
+import numpy as np
+from groq import Groq
+
+from .client import get_http_client
+from .memory import get_rss_mb
+
+TRANSCRIPTIONS_PATH: str = "openai/v1/audio/transcriptions"
+# Frames encoded per chunk sent on the wire (~256 KiB of 16-bit mono audio)
+CHUNK_FRAMES: int = 128 * 1024
+# Same retry policy as the Groq SDK for the requests it makes itself
+MAX_RETRIES: int = 2
+RETRY_BACKOFF: float = 0.5
+RETRY_STATUSES = (408, 409, 429)
+
+
+def _wav_header(frame_count: int, rate: int, channels: int) -> bytes:
+    """Header of a 16-bit PCM WAV file holding frame_count frames."""
+    data_size = frame_count * channels * 2
+    return (
+        b"RIFF"
+        + struct.pack("<I", 36 + data_size)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, channels, rate, rate * channels * 2, channels * 2, 16)
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
+
+
+def _to_pcm16(source: np.ndarray, target: np.ndarray) -> None:
+    """Convert samples of any sounddevice format into int16 target, scaling integers."""
+    if source.dtype.kind == "f":
+        np.multiply(np.clip(source, -1.0, 1.0), 32767, out=target, casting="unsafe")
+    elif source.dtype.kind == "u":
+        # Unsigned formats are centered on half their range
+        np.subtract(
+            source, 1 << (8 * source.itemsize - 1), out=target, dtype=np.int32, casting="unsafe"
+        )
+        np.left_shift(target, 16 - 8 * source.itemsize, out=target)
+    elif source.itemsize > 2:
+        np.right_shift(source, 8 * source.itemsize - 16, out=target, casting="unsafe")
+    else:
+        np.left_shift(source, 16 - 8 * source.itemsize, out=target, dtype=np.int16)
+
+
+def _encode_pcm16(frames: Sequence[np.ndarray], channels: int) -> Iterator[bytes]:
+    """Encode frames to little-endian int16 chunks of at most CHUNK_FRAMES frames.
+
+    Conversion goes through a single reused buffer; each chunk is yielded as its own
+    bytes copy, since a transport may keep chunks around (e.g. buffer the whole body)
+    before asking for the next one.
+    """
+    buffer = np.empty((CHUNK_FRAMES, channels), dtype="<i2")
+    filled = 0
+    for block in frames:
+        offset = 0
+        while offset < len(block):
+            count = min(len(block) - offset, CHUNK_FRAMES - filled)
+            source = block[offset:offset + count]
+            target = buffer[filled:filled + count]
+            _to_pcm16(source, target)
+            filled += count
+            offset += count
+            if filled == CHUNK_FRAMES:
+                yield buffer.tobytes()
+                filled = 0
+    if filled:
+        yield buffer[:filled].tobytes()
+
+
+class UploadStats:
+    def __init__(self) -> None:
+        self.bytes_sent: int = 0
+        self.rss_before_mb: float = 0.0
+        self.rss_peak_mb: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.bytes_sent / 1024:.0f} KiB streamed, RSS {self.rss_before_mb:.1f} MiB "
+            f"before, {self.rss_peak_mb:.1f} MiB peak "
+            f"(+{self.rss_peak_mb - self.rss_before_mb:.1f} MiB)"
+        )
+
+
+def stream_transcription(
+    client: Groq,
+    frames: List[np.ndarray],
+    rate: int,
+    channels: int,
+    fields: Dict[str, str],
+    stats: UploadStats,
+) -> str:
+    """Upload recorded frames as a WAV file, encoding them while the body is being sent.
+
+    The multipart body is generated chunk by chunk from the recorder buffers, so the
+    full file never exists in memory; the total size is known up front, which lets
+    the request use a regular Content-Length instead of chunked encoding.
+    """
+    boundary = uuid.uuid4().hex
+    frame_count = sum(len(block) for block in frames)
+
+    preamble = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    )
+    preamble += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="audio.wav"\r\n'
+        f"Content-Type: audio/wav\r\n\r\n"
+    ).encode() + _wav_header(frame_count, rate, channels)
+    epilogue = f"\r\n--{boundary}--\r\n".encode()
+    content_length = len(preamble) + frame_count * channels * 2 + len(epilogue)
+
+    def body() -> Iterator[bytes]:
+        yield preamble
+        for chunk in _encode_pcm16(frames, channels):
+            stats.bytes_sent += len(chunk)
+            stats.rss_peak_mb = max(stats.rss_peak_mb, get_rss_mb())
+            yield chunk
+        yield epilogue
+
+    # The pooled httpx client shared with the SDK, see client.create_client()
+    http_client = get_http_client(client)
+    for attempt in range(MAX_RETRIES + 1):
+        # The body is generated again from the recorder buffers on every attempt
+        stats.bytes_sent = 0
+        stats.rss_before_mb = stats.rss_peak_mb = get_rss_mb()
+        try:
+            response = http_client.post(
+                str(client.base_url).rstrip("/") + "/" + TRANSCRIPTIONS_PATH,
+                content=body(),
+                headers={
+                    "Authorization": f"Bearer {client.api_key}",
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                    "Content-Length": str(content_length),
+                },
+            )
+            retry = response.status_code in RETRY_STATUSES or response.status_code >= 500
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            retry = True
+        if not retry or attempt == MAX_RETRIES:
+            break
+        time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    response.raise_for_status()
+    return response.text
@@ -0,0 +1,202 @@
+import glob
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+FRAME_MS: int = 20
+# Speech must be this many dB above the noise floor, and above an absolute minimum
+SPEECH_MARGIN_DB: float = 12.0
+MIN_SPEECH_DB: float = -50.0
+NOISE_FLOOR_ADAPTATION: float = 0.05
+
+
+class Endpointer:
+    """Streaming energy-based end-of-speech detector fed with recorder blocks.
+
+    Blocks are cut into 20 ms frames; once some speech has been heard, the end of
+    speech is declared after trailing_silence_ms of frames below the speech threshold.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        trailing_silence_ms: int = 700,
+        min_speech_ms: int = 200,
+        no_speech_timeout_ms: int = 8000,
+    ) -> None:
+        self.rate: int = rate
+        self.frame_size: int = rate * FRAME_MS // 1000
+        self.trailing_frames: int = max(1, trailing_silence_ms // FRAME_MS)
+        self.min_speech_frames: int = max(1, min_speech_ms // FRAME_MS)
+        self.no_speech_frames: int = max(1, no_speech_timeout_ms // FRAME_MS)
+        self.noise_floor_db: Optional[float] = None
+        self.frames_seen: int = 0
+        self.speech_frames: int = 0
+        self.silent_frames: int = 0
+        self.last_speech_frame: int = 0
+        self.ended: bool = False
+        self._remainder: np.ndarray = np.empty(0, dtype=np.float32)
+        # Frame energies kept until speech is detected, so they can be classified
+        # again when the noise floor turns out to be lower than first measured
+        self._energies: List[float] = []
+
+    @property
+    def speech_detected(self) -> bool:
+        return self.speech_frames >= self.min_speech_frames
+
+    @property
+    def end_time(self) -> float:
+        """Position in seconds of the audio processed when the end was declared."""
+        return self.frames_seen * FRAME_MS / 1000
+
+    @property
+    def speech_end_time(self) -> float:
+        """Position in seconds of the last frame classified as speech."""
+        return self.last_speech_frame * FRAME_MS / 1000
+
+    def process(self, block: np.ndarray) -> bool:
+        """Feed a block of samples; return True once the end of speech is reached."""
+        if self.ended:
+            return True
+
+        samples = normalize_samples(block)
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+
+        usable = len(samples) - len(samples) % self.frame_size
+        self._remainder = samples[usable:].copy()
+        if not usable:
+            return False
+
+        frames = samples[:usable].reshape(-1, self.frame_size)
+        energies = 10 * np.log10(np.mean(np.square(frames, dtype=np.float64), axis=1) + 1e-12)
+
+        for energy in energies:
+            self.frames_seen += 1
+            if not self.speech_detected:
+                self._energies.append(float(energy))
+            if self.noise_floor_db is None:
+                self.noise_floor_db = float(energy)
+            threshold = max(self.noise_floor_db + SPEECH_MARGIN_DB, MIN_SPEECH_DB)
+            if energy >= threshold:
+                self.speech_frames += 1
+                self.silent_frames = 0
+                self.last_speech_frame = self.frames_seen
+            else:
+                self.silent_frames += 1
+                # Only silence updates the noise floor: follow it down at once, up slowly
+                if energy < self.noise_floor_db:
+                    self.noise_floor_db = float(energy)
+                    if not self.speech_detected:
+                        # The recording may have started mid-word, in which case the
+                        # first frames set the floor at speech level
+                        self._reclassify()
+                else:
+                    self.noise_floor_db += NOISE_FLOOR_ADAPTATION * (energy - self.noise_floor_db)
+            if self.speech_detected:
+                self._energies = []
+
+            if self.speech_detected:
+                if self.silent_frames >= self.trailing_frames:
+                    self.ended = True
+            elif self.frames_seen >= self.no_speech_frames:
+                self.ended = True
+            if self.ended:
+                return True
+        return False
+
+    def _reclassify(self) -> None:
+        """Classify the frames seen so far again against the current noise floor."""
+        assert self.noise_floor_db is not None
+        threshold = max(self.noise_floor_db + SPEECH_MARGIN_DB, MIN_SPEECH_DB)
+        self.speech_frames = 0
+        self.silent_frames = 0
+        for index, energy in enumerate(self._energies, start=1):
+            if energy >= threshold:
+                self.speech_frames += 1
+                self.silent_frames = 0
+                self.last_speech_frame = index
+            else:
+                self.silent_frames += 1
+
+
+def normalize_samples(block: np.ndarray) -> np.ndarray:
+    """Mono float samples in [-1, 1], scaled by the source sample format."""
+    if block.dtype.kind != "f":
+        block = block.astype(np.float32) / np.iinfo(block.dtype).max
+    return block.mean(axis=1) if block.ndim > 1 else block
+
+
+def evaluate_endpointer(
+    fixtures_dir: str,
+    trailing_silence_ms: int = 700,
+    block_size: int = 512,
+) -> str:
+    """Replay WAV fixtures through the endpointer and report latency and false cuts.
+
+    Each fixture is a WAV file with a JSON sidecar holding the true end of speech in
+    seconds, e.g. {"speech_end": 2.35}. A false cut is an end declared before it.
+    """
+    import soundfile as sf
+
+    latencies: List[float] = []
+    false_cuts = 0
+    missed = 0
+    paths = sorted(glob.glob(os.path.join(fixtures_dir, "*.wav")))
+    for path in paths:
+        with open(os.path.splitext(path)[0] + ".json", "r") as f:
+            speech_end = float(json.load(f)["speech_end"])
+        data, rate = sf.read(path, dtype="float32", always_2d=True)
+
+        endpointer = Endpointer(rate, trailing_silence_ms=trailing_silence_ms)
+        ended = False
+        for start in range(0, len(data), block_size):
+            if endpointer.process(data[start:start + block_size]):
+                ended = True
+                break
+
+        name = os.path.basename(path)
+        if not ended:
+            missed += 1
+            print(f"{name}: no end detected")
+        elif endpointer.end_time < speech_end:
+            false_cuts += 1
+            print(f"{name}: false cut at {endpointer.end_time:.2f}s (speech ends {speech_end:.2f}s)")
+        else:
+            latency = endpointer.end_time - speech_end
+            latencies.append(latency)
+            print(f"{name}: end at {endpointer.end_time:.2f}s, latency {latency * 1000:.0f} ms")
+
+    if not paths:
+        return f"No fixtures found in {fixtures_dir}"
+    summary = (
+        f"{len(paths)} fixtures, false cuts {false_cuts / len(paths):.1%}, "
+        f"missed {missed}"
+    )
+    if latencies:
+        summary += (
+            f", latency mean {np.mean(latencies) * 1000:.0f} ms, "
+            f"p90 {np.percentile(latencies, 90) * 1000:.0f} ms"
+        )
+    return summary
+
+
+def trim_silence(data: np.ndarray, rate: int, margin_ms: int = 200) -> np.ndarray:
+    """Return a view of data without its leading and trailing silence."""
+    frame_size = rate * FRAME_MS // 1000
+    samples = normalize_samples(data)
+    usable = len(samples) - len(samples) % frame_size
+    if not usable:
+        return data
+    frames = samples[:usable].reshape(-1, frame_size)
+    energies = 10 * np.log10(np.mean(np.square(frames, dtype=np.float64), axis=1) + 1e-12)
+    threshold = max(float(energies.min()) + SPEECH_MARGIN_DB, MIN_SPEECH_DB)
+    voiced = np.flatnonzero(energies >= threshold)
+    if not len(voiced):
+        return data[:0]
+    margin = rate * margin_ms // 1000
+    start = max(0, int(voiced[0]) * frame_size - margin)
+    end = min(len(data), (int(voiced[-1]) + 1) * frame_size + margin)
+    return data[start:end]
@@ -0,0 +1,186 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+class _Rule:
+    __slots__ = ("pattern", "replacement", "case_sensitive")
+
+    def __init__(self, pattern: str, replacement: str, case_sensitive: bool) -> None:
+        self.pattern: str = pattern
+        self.replacement: str = replacement
+        self.case_sensitive: bool = case_sensitive
+
+
+def _lower(text: str) -> str:
+    """Lowercase text while keeping a 1:1 mapping between character offsets."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') expand when lowercased; keep those as-is
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+class Automaton:
+    """Aho-Corasick automaton matching every rule in a single pass over the text."""
+
+    def __init__(self, rules: List[_Rule]) -> None:
+        self.rules: List[_Rule] = rules
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Rule indices ending at each state, longest first, including the fail chain
+        self.outputs: List[List[int]] = [[]]
+
+        for index, rule in enumerate(rules):
+            state = 0
+            for c in _lower(rule.pattern):
+                next_state = self.goto[state].get(c)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[state][c] = next_state
+                state = next_state
+            self.outputs[state].append(index)
+
+        # Breadth-first pass to compute failure links
+        queue: List[int] = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for c, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and c not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(c, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = (
+                    self.outputs[next_state] + self.outputs[self.fail[next_state]]
+                )
+
+    def apply(self, text: str) -> str:
+        """Replace the leftmost-longest, word-bounded matches of every rule in text."""
+        if not self.rules or not text:
+            return text
+
+        lowered = _lower(text)
+        length = len(text)
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        rules = self.rules
+        # best[start] = (end, rule index) of the longest valid match starting there
+        best: Dict[int, Tuple[int, int]] = {}
+
+        state = 0
+        for end, c in enumerate(lowered, 1):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if not outputs[state]:
+                continue
+            if end < length and _is_word_char(text[end]):
+                continue
+            for index in outputs[state]:
+                rule = rules[index]
+                start = end - len(rule.pattern)
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if rule.case_sensitive and text[start:end] != rule.pattern:
+                    continue
+                current = best.get(start)
+                if current is None or current[0] < end:
+                    best[start] = (end, index)
+                break
+
+        if not best:
+            return text
+
+        pieces: List[str] = []
+        position = 0
+        cursor = 0
+        for start in sorted(best):
+            if start < cursor:
+                continue
+            end, index = best[start]
+            pieces.append(text[position:start])
+            pieces.append(self._replacement(rules[index], text[start:end]))
+            position = cursor = end
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    @staticmethod
+    def _replacement(rule: _Rule, matched: str) -> str:
+        replacement = rule.replacement
+        # Keep sentence capitalization for all-lowercase expansions ("btw" -> "by the way")
+        if (
+            not rule.case_sensitive
+            and replacement.islower()
+            and matched[:1].isupper()
+        ):
+            return replacement[:1].upper() + replacement[1:]
+        return replacement
+
+
+def load_rules(path: str) -> List[_Rule]:
+    """Load replacement and snippet rules from a vocabulary JSON file.
+
+    The file holds two optional objects: "replacements", matched case-insensitively
+    (e.g. {"groq": "Groq"}), and "snippets", whose triggers must match exactly.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    rules: List[_Rule] = []
+    for pattern, replacement in data.get("replacements", {}).items():
+        if pattern:
+            rules.append(_Rule(pattern, str(replacement), case_sensitive=False))
+    for trigger, expansion in data.get("snippets", {}).items():
+        if trigger:
+            rules.append(_Rule(trigger, str(expansion), case_sensitive=True))
+    return rules
+
+
+class Vocabulary:
+    """Post-processor applying a user dictionary to transcripts.
+
+    The automaton is rebuilt only when the dictionary file changes on disk.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._signature: Optional[Tuple[int, int]] = None
+        self._automaton: Automaton = Automaton([])
+
+    def _refresh(self) -> None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            if self._signature is not None:
+                self._signature = None
+                self._automaton = Automaton([])
+            return
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+
+        try:
+            rules = load_rules(self.path)
+        except Exception as e:
+            print(f"Could not load vocabulary from {self.path}: {e}")
+            return
+        self._automaton = Automaton(rules)
+        self._signature = signature
+        print(f"Loaded {len(rules)} vocabulary rules from {self.path}")
+
+    def apply(self, text: str) -> str:
+        self._refresh()
+        return self._automaton.apply(text)